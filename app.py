@@ -1,9 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import json
+import os
+from contextlib import nullcontext
+
+import memory_audit
+from audit_log import AuditLog
+from clinical_schema import validate_record
+from cooccurrence import RiskFactorBitsets
+from drift_monitor import DriftMonitor
+from memory_audit import MemoryAudit
+from model_registry import ModelRegistry
+from model_set import INCUMBENT, ModelSet, candidates_fingerprint
+from reports import ReportService
 
 # ============================================
 # PAGE CONFIGURATION
@@ -176,27 +189,37 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# ============================================
+# MEMORY AUDIT (MEMORY_AUDIT=1)
+# ============================================
+@st.cache_resource
+def get_memory_audit():
+    """Process-wide memory audit, shared by all sessions"""
+    return MemoryAudit().start()
+
+audit = get_memory_audit() if memory_audit.ENABLED else None
+
+def track_shared(name):
+    return audit.track_shared(name) if audit else nullcontext()
+
+# ============================================
+# STATIC EXPORT (STATIC_EXPORT=1)
+# ============================================
+# Set by export_static.py, which renders the pages once to HTML: no
+# registry watcher, audit database or report pool is started for it
+STATIC_EXPORT = os.environ.get("STATIC_EXPORT", "") == "1"
+
 # ============================================
 # LOAD MODELS
 # ============================================
 @st.cache_resource
-def load_models():
-    """Load all models and metadata"""
+def load_registry():
+    """Load the model registry and start watching models/ for updates"""
     try:
         # Clinical model (UCI dataset) - Logistic Regression with StandardScaler
-        clinical_model = pickle.load(open("models/heart_disease_model.pkl", "rb"))
-        
-        # Get feature names
-        clinical_features_raw = pickle.load(open("models/feature_names.pkl", "rb"))
-        if hasattr(clinical_features_raw, 'tolist'):
-            clinical_features = clinical_features_raw.tolist()
-        else:
-            clinical_features = list(clinical_features_raw)
-        
-        return {
-            "clinical_model": clinical_model,
-            "clinical_features": clinical_features
-        }
+        with track_shared("model"):
+            registry = ModelRegistry()
+            return registry if STATIC_EXPORT else registry.start_watcher()
     except FileNotFoundError as e:
         st.error(f"❌ Model files not found: {e}")
         st.info("Please ensure clinical model files are in the 'models/' directory")
@@ -206,8 +229,217 @@ def load_models():
         st.exception(e)
         st.stop()
 
-# Load models once at startup
-models = load_models()
+# Registry is shared across sessions; each rerun takes the active model snapshot
+registry = load_registry()
+models = registry.current()
+
+@st.cache_resource
+def get_audit_log():
+    """Prediction audit log, shared by all sessions"""
+    return AuditLog()
+
+audit_log = None if STATIC_EXPORT else get_audit_log()
+
+@st.cache_resource
+def get_report_service():
+    """Background worker pool for printable diagnostic reports"""
+    return ReportService()
+
+report_service = None if STATIC_EXPORT else get_report_service()
+REPORT_POLL_SECONDS = 1
+
+def show_report(report_job):
+    """Download button for the last diagnosis' report, or where it stands"""
+    report_status = report_service.status(report_job)
+    if report_status == "done":
+        st.download_button(
+            "⬇️ Download Report (HTML, printable)",
+            data=report_service.read(report_job),
+            file_name=report_service.filename(report_job),
+            mime="text/html",
+            key="report_download"
+        )
+    elif report_status == "pending":
+        st.info("Preparing the report for the last diagnosis...")
+        st.button("🔄 Check Report", key="report_refresh")
+    elif report_status == "failed":
+        st.error(f"⚠️ Report generation failed: {report_service.error(report_job)}")
+    else:
+        st.info("The report for the last diagnosis is no longer available. Run the diagnostic again.")
+
+@st.cache_resource(max_entries=1)
+def get_drift_monitor(model_version, _models):
+    """Drift sketches for the active model; reset when a new model is swapped in"""
+    return DriftMonitor(_models["clinical_features"], model=_models["clinical_model"])
+
+drift_monitor = get_drift_monitor(models["version"], models)
+
+@st.cache_resource(max_entries=1)
+def get_model_set(model_version, candidates, _models):
+    """Incumbent plus models/candidates/*.pkl; rebuilt when either changes"""
+    return ModelSet(_models["clinical_model"], _models["clinical_features"])
+
+model_set = get_model_set(models["version"], candidates_fingerprint(), models)
+
+# ============================================
+# SHARED READ-ONLY DATA
+# ============================================
+# Everything below is loaded once per process and shared by all sessions.
+# Sessions keep only their widget values; nothing here may be mutated.
+@st.cache_resource
+def load_insight(name):
+    """Load one insights/*.json file"""
+    with track_shared(f"insights/{name}.json"):
+        with open(f"insights/{name}.json", "r") as f:
+            return json.load(f)
+
+@st.cache_resource
+def load_asset(name):
+    """Raw bytes of an insights chart, or None if missing"""
+    # Try different file extensions
+    possible_files = [
+        f"insights/{name}.png",
+        f"insights/{name}.jpg",
+        f"insights/{name}"
+    ]
+    for filepath in possible_files:
+        if os.path.exists(filepath):
+            with track_shared(filepath):
+                with open(filepath, "rb") as f:
+                    return f.read()
+    return None
+
+@st.cache_resource
+def build_cvd_deaths_figure():
+    """Home page pie chart"""
+    fig = px.pie(
+        values=[28, 72], 
+        names=['CVD Deaths (28%)', 'Other Causes (72%)'],
+        hole=0.4,
+        color_discrete_sequence=['#ef4444', '#3b82f6']
+    )
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=16, color='#e8e8e8')
+    )
+    return fig
+
+@st.cache_resource
+def build_age_prevalence_figure():
+    """Insights page bar chart of CVD prevalence by age group"""
+    age_data = load_insight("demographic_insights")['age_groups']
+    age_df = pd.DataFrame([
+        {'Age Group': k, 'CVD Prevalence (%)': v}
+        for k, v in age_data.items()
+    ])
+    
+    fig = px.bar(
+        age_df,
+        x='Age Group',
+        y='CVD Prevalence (%)',
+        color='CVD Prevalence (%)',
+        color_continuous_scale=['#10b981', '#f59e0b', '#ef4444'],
+        text='CVD Prevalence (%)'
+    )
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e8e8e8'),
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+@st.cache_resource
+def load_cooccurrence():
+    """Risk-factor co-occurrence tables from bit-packed patient masks"""
+    with track_shared("cooccurrence"):
+        bitsets = RiskFactorBitsets.from_csv()
+        return {
+            "names": bitsets.names,
+            "pairs": bitsets.pair_matrix(),
+            "combinations": bitsets.combination_table(min_order=2),
+            "distribution": bitsets.factor_count_distribution(),
+        }
+
+COOCCURRENCE_METRICS = {
+    "Patients with both": ("count", "Blues", "d"),
+    "CVD prevalence (%)": ("cvd_prevalence", "Reds", ".1f"),
+    "Lift (observed / expected)": ("lift", "RdBu_r", ".2f"),
+}
+
+@st.cache_resource
+def build_cooccurrence_heatmap(metric):
+    """Pairwise risk-factor heatmap for one metric"""
+    data = load_cooccurrence()
+    column, scale, fmt = COOCCURRENCE_METRICS[metric]
+    matrix = data["pairs"].pivot(index="factor_a", columns="factor_b", values=column)
+    matrix = matrix.loc[data["names"], data["names"]]
+    
+    fig = px.imshow(
+        matrix,
+        text_auto=fmt,
+        color_continuous_scale=scale,
+        color_continuous_midpoint=1.0 if column == "lift" else None,
+        labels=dict(x="", y="", color=metric)
+    )
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e8e8e8'),
+        height=500
+    )
+    return fig
+
+@st.cache_resource
+def build_upset_figure(top=15):
+    """UpSet view: patients with exactly each risk-factor combination"""
+    data = load_cooccurrence()
+    names = data["names"]
+    combos = data["combinations"].head(top)
+    x = list(range(len(combos)))
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.6, 0.4], vertical_spacing=0.03)
+    fig.add_trace(go.Bar(
+        x=x,
+        y=combos["count"],
+        marker=dict(
+            color=combos["cvd_prevalence"],
+            colorscale=['#10b981', '#f59e0b', '#ef4444'],
+            colorbar=dict(title="CVD %", len=0.6, y=0.75)
+        ),
+        text=combos["count"],
+        textposition='outside',
+        customdata=combos["cvd_prevalence"],
+        hovertemplate="%{y} patients<br>CVD prevalence %{customdata:.1f}%<extra></extra>"
+    ), row=1, col=1)
+    
+    # Dot matrix: grey for absent factors, connected cyan dots for the combination
+    for i, combo in zip(x, combos["factors"]):
+        fig.add_trace(go.Scatter(
+            x=[i] * len(names), y=names, mode="markers",
+            marker=dict(size=10, color="rgba(232,232,232,0.2)"),
+            hoverinfo="skip"
+        ), row=2, col=1)
+        fig.add_trace(go.Scatter(
+            x=[i] * len(combo), y=list(combo), mode="markers+lines",
+            marker=dict(size=12, color="#00d9ff"), line=dict(color="#00d9ff", width=3),
+            hoverinfo="skip"
+        ), row=2, col=1)
+    
+    fig.update_xaxes(showticklabels=False)
+    fig.update_yaxes(title_text="Patients", row=1, col=1)
+    fig.update_yaxes(categoryorder="array", categoryarray=names, row=2, col=1)
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e8e8e8'),
+        showlegend=False,
+        height=600
+    )
+    return fig
 
 # ============================================
 # SIDEBAR NAVIGATION
@@ -221,9 +453,14 @@ app_mode = st.sidebar.radio(
     help="Select based on available information"
 )
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("**ℹ️ About**")
-st.sidebar.info("""
+if audit:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    render_token = audit.begin_render(get_script_run_ctx().session_id, app_mode)
+
+try:
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**ℹ️ About**")
+    st.sidebar.info("""
 **🧠 Dual-Purpose System**
 
 🇧🇩 **Bangladesh CVD Insights**
@@ -244,18 +481,18 @@ Bangladesh section shows population patterns,
 not individual risk predictions.
 """)
 
-# ============================================
-# HOME PAGE
-# ============================================
-if app_mode == "🏠 Home":
-    st.markdown("""
+    # ============================================
+    # HOME PAGE
+    # ============================================
+    if app_mode == "🏠 Home":
+        st.markdown("""
         <div style='text-align: center; padding: 20px;'>
             <h1 style='font-size: 3.5rem; margin-bottom: 10px;'>🫀 Bangladesh Heart Disease AI</h1>
             <p style='font-size: 1.5rem; color: #00d9ff;'>Dual-Engine Risk Assessment System</p>
         </div>
     """, unsafe_allow_html=True)
     
-    st.markdown("""
+        st.markdown("""
         <div class='content-card'>
             <h2>📊 Why This Matters</h2>
             <p style='font-size: 1.2rem; line-height: 1.8;'>
@@ -266,7 +503,7 @@ if app_mode == "🏠 Home":
         </div>
     """, unsafe_allow_html=True)
     
-    st.markdown("""
+        st.markdown("""
         <div class='content-card'>
             <h3>Impact of CVD in Bangladesh</h3>
             <p style='color: #b8b8b8; margin-bottom: 20px; font-size: 1.05rem;'>
@@ -276,23 +513,12 @@ if app_mode == "🏠 Home":
         </div>
     """, unsafe_allow_html=True)
     
-    fig = px.pie(
-        values=[28, 72], 
-        names=['CVD Deaths (28%)', 'Other Causes (72%)'],
-        hole=0.4,
-        color_discrete_sequence=['#ef4444', '#3b82f6']
-    )
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=16, color='#e8e8e8')
-    )
-    st.plotly_chart(fig, width='stretch')
+        st.plotly_chart(build_cvd_deaths_figure(), width='stretch')
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("""
+        with col1:
+            st.markdown("""
             <div style='background: #2d3748; 
                         padding: 30px; border-radius: 15px; 
                         box-shadow: 0 8px 32px rgba(0,0,0,0.4);
@@ -320,8 +546,8 @@ if app_mode == "🏠 Home":
             </div>
         """, unsafe_allow_html=True)
     
-    with col2:
-        st.markdown("""
+        with col2:
+            st.markdown("""
             <div style='background: #2d3748; 
                         padding: 30px; border-radius: 15px; 
                         box-shadow: 0 8px 32px rgba(0,0,0,0.4);
@@ -349,75 +575,71 @@ if app_mode == "🏠 Home":
             </div>
         """, unsafe_allow_html=True)
 
-# ============================================
-# BANGLADESH CVD INSIGHTS DASHBOARD
-# ============================================
-elif app_mode == "🇧🇩 Bangladesh CVD Insights":
-    st.markdown("<h1>🇧🇩 Cardiovascular Disease Patterns in Bangladesh</h1>", unsafe_allow_html=True)
+    # ============================================
+    # BANGLADESH CVD INSIGHTS DASHBOARD
+    # ============================================
+    elif app_mode == "🇧🇩 Bangladesh CVD Insights":
+        st.markdown("<h1>🇧🇩 Cardiovascular Disease Patterns in Bangladesh</h1>", unsafe_allow_html=True)
     
-    st.info("""
+        st.info("""
     **📊 Educational Dashboard**  
     Explore CVD patterns and risk factors in the Bangladeshi population based on the CAIR-CVD 2025 dataset (1,529 patients).
     This section provides insights into population health, not individual risk predictions.
     """)
     
-    # Load insights data
-    try:
-        import json
-        with open("insights/key_insights.json", "r") as f:
-            insights = json.load(f)
-        with open("insights/demographic_insights.json", "r") as f:
-            demographics = json.load(f)
-        with open("insights/lifestyle_impact.json", "r") as f:
-            lifestyle_impact = json.load(f)
-    except FileNotFoundError:
-        st.error("⚠️ Insights data not found. Please ensure the 'insights' folder is in your project directory.")
-        st.stop()
-    
-    # ============================================
-    # KEY STATISTICS
-    # ============================================
-    st.markdown("### 📈 Key Statistics")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Total Patients Analyzed",
-            f"{insights['dataset_info']['total_patients']:,}",
-            delta=None
-        )
+        # Load insights data
+        try:
+            insights = load_insight("key_insights")
+            demographics = load_insight("demographic_insights")
+            lifestyle_impact = load_insight("lifestyle_impact")
+        except FileNotFoundError:
+            st.error("⚠️ Insights data not found. Please ensure the 'insights' folder is in your project directory.")
+            st.stop()
+    
+        # ============================================
+        # KEY STATISTICS
+        # ============================================
+        st.markdown("### 📈 Key Statistics")
+    
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            st.metric(
+                "Total Patients Analyzed",
+                f"{insights['dataset_info']['total_patients']:,}",
+                delta=None
+            )
     
-    with col2:
-        st.metric(
-            "CVD Prevalence",
-            insights['dataset_info']['cvd_prevalence'],
-            delta="High prevalence cohort",
-            delta_color="inverse"
-        )
+        with col2:
+            st.metric(
+                "CVD Prevalence",
+                insights['dataset_info']['cvd_prevalence'],
+                delta="High prevalence cohort",
+                delta_color="inverse"
+            )
     
-    with col3:
-        st.metric(
-            "Most Affected Age",
-            insights['demographics']['most_affected_age_group'],
-            delta=f"{demographics['age_groups']['50-60']:.1f}% prevalence"
-        )
+        with col3:
+            st.metric(
+                "Most Affected Age",
+                insights['demographics']['most_affected_age_group'],
+                delta=f"{demographics['age_groups']['50-60']:.1f}% prevalence"
+            )
     
-    with col4:
-        st.metric(
-            "Gender Difference",
-            "Minimal",
-            delta=f"F: {insights['demographics']['female_prevalence']} | M: {insights['demographics']['male_prevalence']}"
-        )
+        with col4:
+            st.metric(
+                "Gender Difference",
+                "Minimal",
+                delta=f"F: {insights['demographics']['female_prevalence']} | M: {insights['demographics']['male_prevalence']}"
+            )
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # ============================================
-    # RISK FACTORS COMPARISON
-    # ============================================
-    st.markdown("### 🎯 Major Risk Factors: CVD Patients vs Healthy Individuals")
+        # ============================================
+        # RISK FACTORS COMPARISON
+        # ============================================
+        st.markdown("### 🎯 Major Risk Factors: CVD Patients vs Healthy Individuals")
     
-    st.markdown("""
+        st.markdown("""
     <div style='background: rgba(15, 52, 96, 0.6); padding: 20px; border-radius: 10px; margin-bottom: 20px;'>
         <p style='color: #e8e8e8; font-size: 1.05rem; line-height: 1.6;'>
             This chart shows the prevalence of major cardiovascular risk factors among CVD patients (red) 
@@ -426,37 +648,23 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
     </div>
     """, unsafe_allow_html=True)
     
-    try:
-        from PIL import Image
-        import os
-        
-        # Try different file extensions
-        possible_files = [
-            "insights/risk_factors_comparison.png",
-            "insights/risk_factors_comparison.jpg",
-            "insights/risk_factors_comparison"
-        ]
-        
-        risk_img = None
-        for filepath in possible_files:
-            if os.path.exists(filepath):
-                risk_img = Image.open(filepath)
-                break
+        try:
+            risk_img = load_asset("risk_factors_comparison")
         
-        if risk_img:
-            st.image(risk_img, width='stretch')
-        else:
-            st.error("⚠️ Risk factors chart not found. Please ensure the file is in the insights folder.")
-    except Exception as e:
-        st.error(f"⚠️ Error loading risk factors chart: {e}")
+            if risk_img:
+                st.image(risk_img, width='stretch')
+            else:
+                st.error("⚠️ Risk factors chart not found. Please ensure the file is in the insights folder.")
+        except Exception as e:
+            st.error(f"⚠️ Error loading risk factors chart: {e}")
     
-    # Top 3 risk factors
-    st.markdown("#### 🔝 Top 3 Risk Factor Differences")
+        # Top 3 risk factors
+        st.markdown("#### 🔝 Top 3 Risk Factor Differences")
     
-    cols = st.columns(3)
-    for idx, factor in enumerate(insights['top_risk_factors']):
-        with cols[idx]:
-            st.markdown(f"""
+        cols = st.columns(3)
+        for idx, factor in enumerate(insights['top_risk_factors']):
+            with cols[idx]:
+                st.markdown(f"""
                 <div style='background: rgba(239, 68, 68, 0.2); padding: 15px; border-radius: 10px; 
                             border-left: 4px solid #ef4444; text-align: center;'>
                     <h4 style='color: #00d9ff; margin: 0;'>{factor['name']}</h4>
@@ -469,14 +677,14 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
                 </div>
             """, unsafe_allow_html=True)
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # ============================================
-    # AGE & GENDER PATTERNS
-    # ============================================
-    st.markdown("### 👥 CVD Prevalence by Age and Gender")
+        # ============================================
+        # AGE & GENDER PATTERNS
+        # ============================================
+        st.markdown("### 👥 CVD Prevalence by Age and Gender")
     
-    st.markdown("""
+        st.markdown("""
     <div style='background: rgba(15, 52, 96, 0.6); padding: 20px; border-radius: 10px; margin-bottom: 20px;'>
         <p style='color: #e8e8e8; font-size: 1.05rem; line-height: 1.6;'>
             CVD prevalence increases with age, peaking in the 50-60 age group at over 90%, then declining slightly 
@@ -485,63 +693,29 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
     </div>
     """, unsafe_allow_html=True)
     
-    try:
-        import os
-        
-        possible_files = [
-            "insights/age_gender_patterns.png",
-            "insights/age_gender_patterns.jpg",
-            "insights/age_gender_patterns"
-        ]
-        
-        age_img = None
-        for filepath in possible_files:
-            if os.path.exists(filepath):
-                age_img = Image.open(filepath)
-                break
+        try:
+            age_img = load_asset("age_gender_patterns")
         
-        if age_img:
-            st.image(age_img, width='stretch')
-        else:
-            st.error("⚠️ Age/gender chart not found.")
-    except Exception as e:
-        st.error(f"⚠️ Error loading age/gender chart: {e}")
+            if age_img:
+                st.image(age_img, width='stretch')
+            else:
+                st.error("⚠️ Age/gender chart not found.")
+        except Exception as e:
+            st.error(f"⚠️ Error loading age/gender chart: {e}")
     
-    # Age group breakdown
-    st.markdown("#### 📊 Prevalence by Age Group")
+        # Age group breakdown
+        st.markdown("#### 📊 Prevalence by Age Group")
     
-    age_data = demographics['age_groups']
-    age_df = pd.DataFrame([
-        {'Age Group': k, 'CVD Prevalence (%)': v}
-        for k, v in age_data.items()
-    ])
-    
-    fig = px.bar(
-        age_df,
-        x='Age Group',
-        y='CVD Prevalence (%)',
-        color='CVD Prevalence (%)',
-        color_continuous_scale=['#10b981', '#f59e0b', '#ef4444'],
-        text='CVD Prevalence (%)'
-    )
-    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e8e8e8'),
-        showlegend=False,
-        height=400
-    )
-    st.plotly_chart(fig, width='stretch')
+        st.plotly_chart(build_age_prevalence_figure(), width='stretch')
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # ============================================
-    # LIFESTYLE IMPACT
-    # ============================================
-    st.markdown("### 💪 Impact of Physical Activity on Health Markers")
+        # ============================================
+        # LIFESTYLE IMPACT
+        # ============================================
+        st.markdown("### 💪 Impact of Physical Activity on Health Markers")
     
-    st.markdown("""
+        st.markdown("""
     <div style='background: rgba(15, 52, 96, 0.6); padding: 20px; border-radius: 10px; margin-bottom: 20px;'>
         <p style='color: #e8e8e8; font-size: 1.05rem; line-height: 1.6;'>
             Physical activity shows measurable benefits on cardiovascular health markers. 
@@ -551,70 +725,58 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
     </div>
     """, unsafe_allow_html=True)
     
-    try:
-        import os
-        
-        possible_files = [
-            "insights/lifestyle_impact.png",
-            "insights/lifestyle_impact.jpg",
-            "insights/lifestyle_impact"
-        ]
-        
-        lifestyle_img = None
-        for filepath in possible_files:
-            if os.path.exists(filepath):
-                lifestyle_img = Image.open(filepath)
-                break
+        try:
+            lifestyle_img = load_asset("lifestyle_impact")
         
-        if lifestyle_img:
-            st.image(lifestyle_img, width='stretch')
-        else:
-            st.error("⚠️ Lifestyle impact chart not found.")
-    except Exception as e:
-        st.error(f"⚠️ Error loading lifestyle impact chart: {e}")
+            if lifestyle_img:
+                st.image(lifestyle_img, width='stretch')
+            else:
+                st.error("⚠️ Lifestyle impact chart not found.")
+        except Exception as e:
+            st.error(f"⚠️ Error loading lifestyle impact chart: {e}")
     
-    # Benefits summary
-    st.markdown("#### ✅ Benefits of High Physical Activity")
+        # Benefits summary
+        st.markdown("#### ✅ Benefits of High Physical Activity")
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("""
+        with col1:
+            st.markdown("""
             <div style='background: rgba(16, 185, 129, 0.2); padding: 20px; border-radius: 10px; 
                         border-left: 4px solid #10b981;'>
                 <h4 style='color: #10b981; margin-top: 0;'>Blood Pressure Improvements</h4>
         """, unsafe_allow_html=True)
         
-        sys_improvement = lifestyle_impact['Systolic BP']['Difference']
-        dia_improvement = lifestyle_impact['Diastolic BP']['Difference']
+            sys_improvement = lifestyle_impact['Systolic BP']['Difference']
+            dia_improvement = lifestyle_impact['Diastolic BP']['Difference']
         
-        st.write(f"• **Systolic BP:** {sys_improvement:.1f} mmHg lower")
-        st.write(f"• **Diastolic BP:** {dia_improvement:.1f} mmHg lower")
-        st.write("• Reduces strain on the heart")
+            st.write(f"• **Systolic BP:** {sys_improvement:.1f} mmHg lower")
+            st.write(f"• **Diastolic BP:** {dia_improvement:.1f} mmHg lower")
+            st.write("• Reduces strain on the heart")
         
-        st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
     
-    with col2:
-        st.markdown("""
+        with col2:
+            st.markdown("""
             <div style='background: rgba(16, 185, 129, 0.2); padding: 20px; border-radius: 10px; 
                         border-left: 4px solid #10b981;'>
                 <h4 style='color: #10b981; margin-top: 0;'>Metabolic Benefits</h4>
         """, unsafe_allow_html=True)
         
-        st.write("• Helps maintain healthy weight")
-        st.write("• Improves insulin sensitivity")
-        st.write("• Reduces diabetes risk")
+            st.write("• Helps maintain healthy weight")
+            st.write("• Improves insulin sensitivity")
+            st.write("• Reduces diabetes risk")
         
-        st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # ============================================
-    # INTERACTIVE EXPLORER
-    # ============================================
-    st.markdown("### 🔍 Interactive Risk Factor Explorer")
+        # ============================================
+        # INTERACTIVE EXPLORER
+        # ============================================
+        st.markdown("### 🔍 Interactive Risk Factor Explorer")
     
-    st.markdown("""
+        st.markdown("""
     <div style='background: rgba(15, 52, 96, 0.6); padding: 20px; border-radius: 10px; margin-bottom: 20px;'>
         <p style='color: #e8e8e8; font-size: 1.05rem; line-height: 1.6;'>
             Explore how different demographic and risk factor combinations affect CVD prevalence in the dataset.
@@ -622,32 +784,31 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
     </div>
     """, unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        selected_age = st.selectbox(
-            "Select Age Group",
-            ["<30", "30-40", "40-50", "50-60", "60+"]
-        )
+        with col1:
+            selected_age = st.selectbox(
+                "Select Age Group",
+                ["<30", "30-40", "40-50", "50-60", "60+"]
+            )
     
-    with col2:
-        selected_gender = st.selectbox(
-            "Select Gender",
-            ["Male", "Female"]
-        )
+        with col2:
+            selected_gender = st.selectbox(
+                "Select Gender",
+                ["Male", "Female"]
+            )
     
-    # Load age-gender data
-    try:
-        with open("insights/age_gender_data.json", "r") as f:
-            age_gender_data = json.load(f)
+        # Load age-gender data
+        try:
+            age_gender_data = load_insight("age_gender_data")
         
-        gender_code = "M" if selected_gender == "Male" else "F"
-        key = f"{selected_age}_{gender_code}"
+            gender_code = "M" if selected_gender == "Male" else "F"
+            key = f"{selected_age}_{gender_code}"
         
-        if key in age_gender_data:
-            data = age_gender_data[key]
+            if key in age_gender_data:
+                data = age_gender_data[key]
             
-            st.markdown(f"""
+                st.markdown(f"""
                 <div style='background: linear-gradient(135deg, rgba(59, 130, 246, 0.3), rgba(236, 72, 153, 0.3)); 
                             padding: 30px; border-radius: 15px; margin-top: 20px; text-align: center;'>
                     <h3 style='color: #00d9ff; margin: 0;'>Selected Group: {selected_age} {selected_gender}s</h3>
@@ -673,17 +834,66 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
                     </div>
                 </div>
             """, unsafe_allow_html=True)
-    except:
-        st.error("⚠️ Age-gender data not found.")
+        except:
+            st.error("⚠️ Age-gender data not found.")
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # ============================================
-    # KEY TAKEAWAYS
-    # ============================================
-    st.markdown("### 💡 Key Takeaways")
+        # ============================================
+        # RISK FACTOR CLUSTERING
+        # ============================================
+        st.markdown("### 🧩 Risk Factor Clustering")
     
-    st.markdown("""
+        st.markdown("""
+    <div style='background: rgba(15, 52, 96, 0.6); padding: 20px; border-radius: 10px; margin-bottom: 20px;'>
+        <p style='color: #e8e8e8; font-size: 1.05rem; line-height: 1.6;'>
+            How often risk factors appear together, and how CVD prevalence changes as they accumulate. 
+            Lift above 1 means a pair co-occurs more often than expected if the factors were independent.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+        try:
+            cooccurrence = load_cooccurrence()
+            distribution = cooccurrence["distribution"]
+        
+            multi = distribution[distribution["risk_factors"] >= 2]
+            multi_share = multi["count"].sum() / distribution["count"].sum() * 100
+        
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Patients with 2+ Risk Factors", f"{multi_share:.1f}%")
+            with col2:
+                none_row = distribution[distribution["risk_factors"] == 0].iloc[0]
+                st.metric("CVD Prevalence, No Risk Factors", f"{none_row['cvd_prevalence']:.1f}%",
+                          delta=f"{int(none_row['count'])} patients", delta_color="off")
+            with col3:
+                multi_prev = (multi["count"] * multi["cvd_prevalence"].fillna(0)).sum() / multi["count"].sum()
+                st.metric("CVD Prevalence, 2+ Risk Factors", f"{multi_prev:.1f}%")
+        
+            tab1, tab2 = st.tabs(["Pairwise Heatmap", "Combinations (UpSet)"])
+            with tab1:
+                metric = st.radio(
+                    "Heatmap Metric",
+                    list(COOCCURRENCE_METRICS),
+                    horizontal=True
+                )
+                st.plotly_chart(build_cooccurrence_heatmap(metric), width='stretch')
+            with tab2:
+                st.caption("Patients with exactly these risk factors (and none of the others), largest groups first. "
+                           "Bar colour shows CVD prevalence within the group.")
+                st.plotly_chart(build_upset_figure(), width='stretch')
+        except Exception as e:
+            st.error(f"⚠️ Error computing risk factor co-occurrence: {e}")
+    
+        st.markdown("---")
+    
+        # ============================================
+        # KEY TAKEAWAYS
+        # ============================================
+        st.markdown("### 💡 Key Takeaways")
+    
+        st.markdown("""
         <div style='background: rgba(59, 130, 246, 0.2); padding: 25px; border-radius: 10px; 
                     border-left: 4px solid #3b82f6;'>
             <h4 style='color: #3b82f6; margin-top: 0;'>Important Insights from Bangladesh CVD Data</h4>
@@ -697,9 +907,9 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
         </div>
     """, unsafe_allow_html=True)
     
-    st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("<br>", unsafe_allow_html=True)
     
-    st.warning("""
+        st.warning("""
         **⚠️ Data Interpretation Note**
         
         This dataset has 85.6% CVD prevalence, indicating it primarily consists of patients seeking cardiovascular care 
@@ -709,18 +919,25 @@ elif app_mode == "🇧🇩 Bangladesh CVD Insights":
         For personal health assessment, please consult with healthcare professionals.
     """)
 
-# ============================================
-# CLINICAL DIAGNOSIS
-# ============================================
-else:
-    st.markdown("<h1>🏥 Clinical Diagnosis</h1>", unsafe_allow_html=True)
-    st.warning(
-        "**⚠️ For Healthcare Professionals Only**  \n"
-        "Requires laboratory and diagnostic test results."
-    )
+    # ============================================
+    # CLINICAL DIAGNOSIS
+    # ============================================
+    else:
+        st.markdown("<h1>🏥 Clinical Diagnosis</h1>", unsafe_allow_html=True)
+        st.warning(
+            "**⚠️ For Healthcare Professionals Only**  \n"
+            "Requires laboratory and diagnostic test results."
+        )
     
-    with st.expander("📚 Parameter Definitions", expanded=False):
-        st.markdown("""
+        # A replacement model dropped into models/ was not promoted
+        if registry.last_error:
+            st.info(
+                f"ℹ️ Serving model {models['version']}. The latest model update was not applied: "
+                f"{registry.last_error}"
+            )
+    
+        with st.expander("📚 Parameter Definitions", expanded=False):
+            st.markdown("""
         **Chest Pain (cp)**  
         - 1: Typical Angina  
         - 2: Atypical Angina  
@@ -744,159 +961,229 @@ else:
         - 3: Downsloping
         """)
     
-    st.markdown("---")
-    st.markdown("<h3>📋 Clinical Parameters</h3>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown("<h3>📋 Clinical Parameters</h3>", unsafe_allow_html=True)
     
-    col1, col2, col3 = st.columns(3)
+        col1, col2, col3 = st.columns(3)
     
-    with col1:
-        st.markdown("**🫀 Cardiac**")
-        cp = st.selectbox(
-            "Chest Pain Type",
-            [1, 2, 3, 4],
-            format_func=lambda x: ["Typical", "Atypical", "Non-anginal", "Asymptomatic"][x - 1]
-        )
-        thalach = st.number_input("Maximum Heart Rate (bpm)", 60, 220, 150)
-        oldpeak = st.number_input("ST Depression", 0.0, 6.0, 1.0, 0.1)
-        slope = st.selectbox(
-            "ST Slope", 
-            [1, 2, 3],
-            format_func=lambda x: ["Upsloping", "Flat", "Downsloping"][x-1]
-        )
+        with col1:
+            st.markdown("**🫀 Cardiac**")
+            cp = st.selectbox(
+                "Chest Pain Type",
+                [1, 2, 3, 4],
+                format_func=lambda x: ["Typical", "Atypical", "Non-anginal", "Asymptomatic"][x - 1]
+            )
+            thalach = st.number_input("Maximum Heart Rate (bpm)", 60, 220, 150)
+            oldpeak = st.number_input("ST Depression", 0.0, 6.0, 1.0, 0.1)
+            slope = st.selectbox(
+                "ST Slope", 
+                [1, 2, 3],
+                format_func=lambda x: ["Upsloping", "Flat", "Downsloping"][x-1]
+            )
     
-    with col2:
-        st.markdown("**🩸 Diagnostic Tests**")
-        ca = st.selectbox("Major Vessels (ca)", [0, 1, 2, 3])
-        thal = st.selectbox(
-            "Thalassemia",
-            [3, 6, 7],
-            format_func=lambda x: {3: "Normal", 6: "Fixed Defect", 7: "Reversible Defect"}[x]
-        )
-        exang = st.selectbox(
-            "Exercise Induced Angina",
-            [0, 1],
-            format_func=lambda x: ["No", "Yes"][x]
-        )
-        restecg = st.selectbox(
-            "Resting ECG",
-            [0, 1, 2],
-            format_func=lambda x: ["Normal", "ST-T Abnormality", "LV Hypertrophy"][x]
-        )
+        with col2:
+            st.markdown("**🩸 Diagnostic Tests**")
+            ca = st.selectbox("Major Vessels (ca)", [0, 1, 2, 3])
+            thal = st.selectbox(
+                "Thalassemia",
+                [3, 6, 7],
+                format_func=lambda x: {3: "Normal", 6: "Fixed Defect", 7: "Reversible Defect"}[x]
+            )
+            exang = st.selectbox(
+                "Exercise Induced Angina",
+                [0, 1],
+                format_func=lambda x: ["No", "Yes"][x]
+            )
+            restecg = st.selectbox(
+                "Resting ECG",
+                [0, 1, 2],
+                format_func=lambda x: ["Normal", "ST-T Abnormality", "LV Hypertrophy"][x]
+            )
     
-    with col3:
-        st.markdown("**📊 Patient Info**")
-        age_c = st.number_input("Age", 20, 100, 50)
-        sex_c = st.selectbox("Sex", ["Female", "Male"])
-        bp_c = st.number_input("Resting Blood Pressure (mmHg)", 80, 200, 120)
-        chol_c = st.number_input("Serum Cholesterol (mg/dL)", 100, 600, 200)
-        fbs_c = st.selectbox(
-            "Fasting Blood Sugar > 120 mg/dL", 
-            [0, 1], 
-            format_func=lambda x: ["No", "Yes"][x]
-        )
+        with col3:
+            st.markdown("**📊 Patient Info**")
+            age_c = st.number_input("Age", 20, 100, 50)
+            sex_c = st.selectbox("Sex", ["Female", "Male"])
+            bp_c = st.number_input("Resting Blood Pressure (mmHg)", 80, 200, 120)
+            chol_c = st.number_input("Serum Cholesterol (mg/dL)", 100, 600, 200)
+            fbs_c = st.selectbox(
+                "Fasting Blood Sugar > 120 mg/dL", 
+                [0, 1], 
+                format_func=lambda x: ["No", "Yes"][x]
+            )
     
-    st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("<br>", unsafe_allow_html=True)
     
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        diag_btn = st.button("🔬 Run Diagnostic", type="primary", key="clinical_btn")
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            diag_btn = st.button("🔬 Run Diagnostic", type="primary", key="clinical_btn")
     
-    # ===============================
-    # PREDICTION
-    # ===============================
-    if diag_btn:
-        try:
-            # Encode sex
-            sex_enc = 1 if sex_c == "Male" else 0
+        # ===============================
+        # PREDICTION
+        # ===============================
+        if diag_btn:
+            try:
+                # Encode sex
+                sex_enc = 1 if sex_c == "Male" else 0
             
-            # Build input exactly as training data
-            input_data = {
-                "age": float(age_c),
-                "sex": float(sex_enc),
-                "cp": float(cp),
-                "trestbps": float(bp_c),
-                "chol": float(chol_c),
-                "fbs": float(fbs_c),
-                "restecg": float(restecg),
-                "thalach": float(thalach),
-                "exang": float(exang),
-                "oldpeak": float(oldpeak),
-                "slope": float(slope),
-                "ca": float(ca),
-                "thal": float(thal)
-            }
+                # Build input exactly as training data
+                input_data = {
+                    "age": float(age_c),
+                    "sex": float(sex_enc),
+                    "cp": float(cp),
+                    "trestbps": float(bp_c),
+                    "chol": float(chol_c),
+                    "fbs": float(fbs_c),
+                    "restecg": float(restecg),
+                    "thalach": float(thalach),
+                    "exang": float(exang),
+                    "oldpeak": float(oldpeak),
+                    "slope": float(slope),
+                    "ca": float(ca),
+                    "thal": float(thal)
+                }
             
-            input_df = pd.DataFrame([input_data])
+                # Same rules the batch path uses; widgets should never trip these
+                input_errors = validate_record(input_data, features=models["clinical_features"])
+                if input_errors:
+                    raise ValueError("Invalid clinical inputs: " + "; ".join(input_errors))
             
-            # Ensure column order matches training
-            input_df = input_df[models["clinical_features"]]
+                input_df = pd.DataFrame([input_data])
             
-            # Predict (model has StandardScaler built-in)
-            prob = models["clinical_model"].predict_proba(input_df)[0][1]
-            pred = models["clinical_model"].predict(input_df)[0]
+                # Ensure column order matches training
+                input_df = input_df[models["clinical_features"]]
             
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("<h2 style='text-align:center;'>🔬 Diagnostic Result</h2>", unsafe_allow_html=True)
+                # Predict (model has StandardScaler built-in); challengers, if any,
+                # score the same row alongside it in shadow mode
+                if model_set.challengers:
+                    scores = model_set.score(input_df)
+                    prob = scores[INCUMBENT].iloc[0]
+                else:
+                    prob = models["clinical_model"].predict_proba(input_df)[0][1]
+                pred = models["clinical_model"].predict(input_df)[0]
             
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=prob * 100,
-                number={"suffix": "%"},
-                title={"text": "Heart Disease Probability"},
-                gauge={
-                    "axis": {"range": [0, 100]},
-                    "bar": {"color": "#ef4444"},
-                    "steps": [
-                        {"range": [0, 30], "color": "rgba(16,185,129,0.3)"},
-                        {"range": [30, 70], "color": "rgba(245,158,11,0.3)"},
-                        {"range": [70, 100], "color": "rgba(239,68,68,0.3)"}
-                    ]
-                }
-            ))
-            fig.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#e8e8e8'),
-                height=300
-            )
-            st.plotly_chart(fig, width='stretch')
+                # Clinical governance record (queued; written in the background)
+                if audit_log:
+                    audit_log.record(input_data, prob, pred, models["version"])
+                drift_monitor.update(input_data, prob)
+                # Rendered in the background; fetched below once ready
+                if report_service:
+                    st.session_state["report_job"] = report_service.submit(
+                        input_data, prob, pred, models["version"]
+                    )
             
-            col1, col2 = st.columns(2)
-            with col1:
-                if pred == 1:
-                    st.error(f"### ⚠️ POSITIVE\n\nRisk: {prob*100:.1f}%")
-                else:
-                    st.success(f"### ✅ NEGATIVE\n\nRisk: {prob*100:.1f}%")
+                st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("<h2 style='text-align:center;'>🔬 Diagnostic Result</h2>", unsafe_allow_html=True)
             
-            with col2:
-                st.metric("Confidence", f"{max(prob, 1 - prob) * 100:.1f}%")
+                fig = go.Figure(go.Indicator(
+                    mode="gauge+number",
+                    value=prob * 100,
+                    number={"suffix": "%"},
+                    title={"text": "Heart Disease Probability"},
+                    gauge={
+                        "axis": {"range": [0, 100]},
+                        "bar": {"color": "#ef4444"},
+                        "steps": [
+                            {"range": [0, 30], "color": "rgba(16,185,129,0.3)"},
+                            {"range": [30, 70], "color": "rgba(245,158,11,0.3)"},
+                            {"range": [70, 100], "color": "rgba(239,68,68,0.3)"}
+                        ]
+                    }
+                ))
+                fig.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#e8e8e8'),
+                    height=300
+                )
+                st.plotly_chart(fig, width='stretch')
             
-            st.markdown("---")
+                col1, col2 = st.columns(2)
+                with col1:
+                    if pred == 1:
+                        st.error(f"### ⚠️ POSITIVE\n\nRisk: {prob*100:.1f}%")
+                    else:
+                        st.success(f"### ✅ NEGATIVE\n\nRisk: {prob*100:.1f}%")
+            
+                with col2:
+                    st.metric("Confidence", f"{max(prob, 1 - prob) * 100:.1f}%")
+            
+                st.caption(f"Model version: {models['version']}")
+            
+                if model_set.challengers or model_set.skipped:
+                    with st.expander("🧪 Challenger Models (shadow)", expanded=False):
+                        if model_set.challengers:
+                            st.caption(
+                                "Scored on the same inputs for comparison only; "
+                                "the diagnosis above uses the incumbent model. "
+                                f"Challengers slower than {model_set.timeout:.1f}s show no score."
+                            )
+                            row = scores.iloc[0]
+                            shadow_df = pd.DataFrame({
+                                "Model": model_set.names,
+                                "Probability (%)": [row[name] * 100 for name in model_set.names],
+                                "Agrees": [
+                                    (row[name] >= model_set.threshold) == (row[INCUMBENT] >= model_set.threshold)
+                                    if pd.notna(row[name]) else None
+                                    for name in model_set.names
+                                ],
+                            })
+                            st.dataframe(shadow_df, width='stretch', hide_index=True)
+                            st.caption(
+                                f"Agreement: {row['agreement'] * 100:.0f}% · "
+                                f"Spread: {row['spread'] * 100:.1f} points"
+                            )
+                        for name, reason in model_set.skipped.items():
+                            st.warning(f"Candidate '{name}' not loaded: {reason}")
+            
+                st.markdown("---")
             
-            if pred == 1:
-                st.error("""
+                if pred == 1:
+                    st.error("""
                 **Recommended Actions**
                 - Immediate cardiology consultation  
                 - Consider angiography / catheterization  
                 - Initiate guideline-based therapy  
                 - Lifestyle modification counseling
                 """)
-            else:
-                st.success("""
+                else:
+                    st.success("""
                 **Maintenance Advice**
                 - Continue routine monitoring  
                 - Maintain heart-healthy lifestyle  
                 - Schedule annual clinical follow-up
                 """)
                 
-        except Exception as e:
-            st.error(f"⚠️ Diagnostic failed: {str(e)}")
-            st.exception(e)
+            except Exception as e:
+                st.error(f"⚠️ Diagnostic failed: {str(e)}")
+                st.exception(e)
+    
+        st.markdown("---")
+    
+        report_job = st.session_state.get("report_job")
+        if report_job:
+            st.markdown("#### 📄 Diagnostic Report")
+            # A pending report polls in a fragment, so only this block reruns and
+            # the result above stays; without fragments (Streamlit < 1.37) the
+            # Check Report button does it by hand
+            if hasattr(st, "fragment") and report_service.status(report_job) == "pending":
+                st.fragment(show_report, run_every=REPORT_POLL_SECONDS)(report_job)
+            else:
+                show_report(report_job)
+            st.markdown("---")
+    
+        with st.expander("📉 Input Drift Monitor", expanded=False):
+            st.caption(
+                f"Last {drift_monitor.window} diagnoses vs the UCI training cohort "
+                f"({drift_monitor.total} scored since model {models['version']} was loaded). "
+                "PSI > 0.1 is a moderate shift, > 0.25 a major shift."
+            )
+            st.dataframe(drift_monitor.report(), width='stretch', hide_index=True)
 
-# ============================================
-# FOOTER
-# ============================================
-st.markdown("<br><br>", unsafe_allow_html=True)
-st.markdown("""
+    # ============================================
+    # FOOTER
+    # ============================================
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    st.markdown("""
     <div style='text-align: center; color: #00d9ff; padding: 20px; 
                 background: rgba(15, 52, 96, 0.4); border-radius: 10px; 
                 border: 1px solid rgba(0, 217, 255, 0.3);'>
@@ -904,4 +1191,21 @@ st.markdown("""
             <strong>⚠️ Medical Disclaimer:</strong> This is a screening tool only and not a substitute for professional medical advice, diagnosis, or treatment.
         </p>
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+finally:
+    # Runs on st.stop() and errors too, so every render opened above is recorded
+    if audit:
+        render = audit.end_render(render_token, st.session_state)
+
+if audit:
+    report = audit.report()
+    with st.sidebar.expander("🧪 Memory Audit", expanded=False):
+        st.write(f"**This render:** {render['net_bytes'] / 1024:.1f} KiB net, {render['render_ms']:.0f} ms")
+        st.write(f"**Session state:** {render['session_state_bytes'] / 1024:.1f} KiB")
+        st.write(f"**Shared data:** {report['shared_bytes'] / 1024 ** 2:.2f} MiB")
+        st.write(f"**Sessions:** {report['session_count']}, "
+                 f"mean state {report['mean_session_state_bytes'] / 1024:.1f} KiB")
+        st.write(f"**Traced:** {report['traced_current_bytes'] / 1024 ** 2:.1f} MiB "
+                 f"(peak {report['traced_peak_bytes'] / 1024 ** 2:.1f} MiB)")
+        st.dataframe(pd.DataFrame(render["top_allocations"]))
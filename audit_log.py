@@ -0,0 +1,220 @@
+"""
+Append-only audit log of clinical predictions.
+
+The request path only puts a record on a bounded in-memory queue; a
+background thread drains it in batches to either a SQLite database in
+WAL mode or rotating gzip-compressed JSON Lines files. Pending records
+are flushed when the log is closed, including at interpreter exit.
+
+A batch the writer rejects is retried with backoff, then spilled to a
+plain JSON Lines file for later replay. Only records that cannot be
+spilled either are counted as dropped.
+"""
+import atexit
+import gzip
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+LOG_DIR = "logs"
+
+
+def _isoformat(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+# ============================================
+# WRITERS
+# ============================================
+class SQLiteWriter:
+    """Batch inserts into a WAL-mode SQLite table"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Only the flusher thread touches the connection after construction
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                probability REAL NOT NULL,
+                label INTEGER NOT NULL,
+                inputs TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def write(self, records):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO predictions (timestamp, model_version, probability, label, inputs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (_isoformat(r["timestamp"]), r["model_version"], r["probability"],
+                     r["label"], json.dumps(r["inputs"], sort_keys=True))
+                    for r in records
+                ],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class JsonlGzWriter:
+    """Gzip-compressed JSON Lines, rotated once a file reaches max_bytes on disk"""
+
+    def __init__(self, directory, prefix="predictions", max_bytes=50 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self._file = None
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, f"{self.prefix}-{stamp}.jsonl.gz")
+        self._file = gzip.open(path, "at", encoding="utf-8")
+
+    def _compressed_size(self):
+        # Position in the underlying file, i.e. compressed bytes flushed so far
+        return self._file.buffer.fileobj.tell()
+
+    def write(self, records):
+        if self._file is None or self._compressed_size() >= self.max_bytes:
+            self._rotate()
+        lines = "".join(
+            json.dumps({**r, "timestamp": _isoformat(r["timestamp"])}, sort_keys=True) + "\n"
+            for r in records
+        )
+        self._file.write(lines)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ============================================
+# AUDIT LOG
+# ============================================
+class AuditLog:
+    """Bounded queue in front of a batching background writer"""
+
+    def __init__(self, backend="sqlite", path=None, capacity=10000,
+                 batch_size=256, flush_interval=1.0, retries=3, retry_delay=0.5,
+                 spill_path=None):
+        if backend == "sqlite":
+            path = path or os.path.join(LOG_DIR, "predictions.sqlite")
+            self.writer = SQLiteWriter(path)
+            log_dir = os.path.dirname(path) or "."
+        elif backend == "jsonl":
+            self.writer = JsonlGzWriter(path or LOG_DIR)
+            log_dir = path or LOG_DIR
+        else:
+            raise ValueError(f"Unknown audit log backend: {backend}")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.spill_path = spill_path or os.path.join(log_dir, "predictions-spill.jsonl")
+        self.dropped = 0
+        self.written = 0
+        self.spilled = 0
+        self.failed_batches = 0
+        self.last_error = None
+
+        self._queue = queue.Queue(maxsize=capacity)
+        self._stop = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="audit-log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, inputs, probability, label, model_version):
+        """Queue one prediction. Never blocks; counts a drop if the buffer is full."""
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait({
+                "timestamp": time.time(),
+                "inputs": inputs,
+                "probability": float(probability),
+                "label": int(label),
+                "model_version": model_version,
+            })
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self, first=None):
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                self.writer.write(batch)
+                self.written += len(batch)
+                return
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+            if attempt < self.retries:
+                time.sleep(delay)
+                delay *= 2
+        self.failed_batches += 1
+        self._spill(batch)
+
+    def _spill(self, batch):
+        """Last resort for a batch the writer keeps rejecting"""
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for r in batch:
+                    f.write(json.dumps({**r, "timestamp": _isoformat(r["timestamp"])}, sort_keys=True) + "\n")
+            self.spilled += len(batch)
+        except Exception as e:
+            self.last_error = f"Spill failed, {len(batch)} records lost: {type(e).__name__}: {e}"
+            self.dropped += len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+        # Shutdown: flush everything still buffered
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            self._write(batch)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self, timeout=10.0):
+        """Stop the flusher after it has written all pending records"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self.writer.close()
@@ -0,0 +1,132 @@
+"""
+Declarative validation for the 13 clinical model inputs.
+
+The schema mirrors the limits of the Clinical Diagnosis widgets so that
+records arriving from files or other callers meet the same rules. Checks
+run column-wise as vectorized masks. Bad rows are quarantined with a
+per-row error report, and the rest of the batch goes on to scoring.
+"""
+import numpy as np
+import pandas as pd
+
+# Same ranges and codes as the Clinical Diagnosis page widgets
+CLINICAL_SCHEMA = {
+    "age": {"min": 20, "max": 100},
+    "sex": {"values": [0, 1]},
+    "cp": {"values": [1, 2, 3, 4]},
+    "trestbps": {"min": 80, "max": 200},
+    "chol": {"min": 100, "max": 600},
+    "fbs": {"values": [0, 1]},
+    "restecg": {"values": [0, 1, 2]},
+    "thalach": {"min": 60, "max": 220},
+    "exang": {"values": [0, 1]},
+    "oldpeak": {"min": 0.0, "max": 6.0},
+    "slope": {"values": [1, 2, 3]},
+    "ca": {"values": [0, 1, 2, 3]},
+    "thal": {"values": [3, 6, 7]},
+}
+
+
+class ValidationResult:
+    """Outcome of validating a batch"""
+
+    def __init__(self, valid, quarantined, errors):
+        # Rows that passed every rule, as float columns in schema order
+        self.valid = valid
+        # Rows that failed, as received, with an "errors" column
+        self.quarantined = quarantined
+        # Long format: one row per (row, column, rule) failure
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return self.errors.empty
+
+    def summary(self):
+        """Failure counts per column and rule"""
+        if self.errors.empty:
+            return pd.DataFrame(columns=["column", "rule", "count"])
+        return self.errors.groupby(["column", "rule"]).size().reset_index(name="count")
+
+
+def _describe(spec):
+    if "values" in spec:
+        return "one of " + ", ".join(str(v) for v in spec["values"])
+    return f"between {spec['min']} and {spec['max']}"
+
+
+def validate(df, schema=CLINICAL_SCHEMA, features=None):
+    """
+    Validate a batch of clinical inputs.
+
+    features sets the output column order (e.g. models["clinical_features"]);
+    it defaults to the schema order. A missing column is a caller error and
+    raises ValueError. Bad values only quarantine their row.
+    """
+    features = list(features or schema)
+    missing = [f for f in features if f not in df.columns]
+    if missing:
+        raise ValueError(f"Missing clinical columns: {missing}")
+
+    n = len(df)
+    bad = np.zeros(n, dtype=bool)
+    failures = []
+    flags = []
+    values = {}
+
+    for column in features:
+        spec = schema[column]
+        x = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+        values[column] = x
+
+        absent = df[column].isna().to_numpy()
+        non_numeric = np.isnan(x) & ~absent
+        if "values" in spec:
+            invalid = ~np.isin(x, spec["values"]) & ~np.isnan(x)
+        else:
+            invalid = ((x < spec["min"]) | (x > spec["max"])) & ~np.isnan(x)
+
+        for rule, mask in (("missing", absent), ("not numeric", non_numeric), (_describe(spec), invalid)):
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                failures.append(pd.DataFrame({
+                    "position": rows,
+                    "row": df.index[rows],
+                    "column": column,
+                    "value": df[column].to_numpy()[rows],
+                    "rule": rule,
+                }))
+                flags.append((f"{column}: {rule}", mask))
+                bad |= mask
+
+    errors = (
+        pd.concat(failures, ignore_index=True) if failures
+        else pd.DataFrame(columns=["position", "row", "column", "value", "rule"])
+    )
+
+    # One 2-D block for the valid rows avoids a per-column consolidation copy
+    keep = np.flatnonzero(~bad)
+    valid = pd.DataFrame(
+        np.column_stack([values[c][keep] for c in features]) if features else None,
+        index=df.index[keep], columns=features
+    )
+    quarantined = df.take(np.flatnonzero(bad))
+    if len(quarantined):
+        # Encode each bad row's failed rules as a bitmask (at most 13 x 3 bits);
+        # only the few distinct combinations are turned into strings
+        codes = np.zeros(int(bad.sum()), dtype=np.int64)
+        for bit, (_, mask) in enumerate(flags):
+            codes |= mask[bad].astype(np.int64) << bit
+        unique, inverse = np.unique(codes, return_inverse=True)
+        labels = np.array([
+            "; ".join(label for bit, (label, _) in enumerate(flags) if code >> bit & 1)
+            for code in unique
+        ], dtype=object)
+        quarantined["errors"] = labels[inverse]
+    return ValidationResult(valid, quarantined, errors)
+
+
+def validate_record(record, schema=CLINICAL_SCHEMA, features=None):
+    """Validate one input dict; returns a list of error messages (empty if valid)"""
+    result = validate(pd.DataFrame([record]), schema, features)
+    return [f"{row.column}: {row.rule} (got {row.value})" for row in result.errors.itertuples()]
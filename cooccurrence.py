@@ -0,0 +1,142 @@
+"""
+Risk-factor co-occurrence over the Bangladesh CVD dataset.
+
+Each binary risk factor is encoded as a packed bitset over patients
+(one bit per patient, 64 patients per uint64 word). Pairwise and
+higher-order combination counts, and the CVD prevalence within each
+combination, are then computed with AND/ANDNOT and popcount, i.e.
+O(factors^2 x n/64) word operations for the pair matrix.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+CVD_DATA = "data/CVD Dataset.csv"
+
+# Same definitions as the insights/*.json summaries
+RISK_FACTORS = {
+    "Smoking": lambda df: df["Smoking Status"] == "Y",
+    "Diabetes": lambda df: df["Diabetes Status"] == "Y",
+    "Family History": lambda df: df["Family History of CVD"] == "Y",
+    "Low Activity": lambda df: df["Physical Activity Level"] == "Low",
+    "High Cholesterol": lambda df: df["Total Cholesterol (mg/dL)"] >= 240,
+    "Hypertension": lambda df: df["Blood Pressure Category"].str.startswith("Hypertension", na=False),
+}
+
+
+def cvd_mask(df):
+    """CVD case: intermediary or high CVD risk level"""
+    return df["CVD Risk Level"].isin(["INTERMEDIARY", "HIGH"])
+
+
+# ============================================
+# BITSETS
+# ============================================
+def pack(mask):
+    """Pack a boolean mask into uint64 words (zero padded)"""
+    mask = np.asarray(mask, dtype=bool)
+    n_words = (len(mask) + 63) // 64
+    padded = np.zeros(n_words * 64, dtype=bool)
+    padded[:len(mask)] = mask
+    return np.packbits(padded, bitorder="little").view(np.uint64)
+
+
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        return int(np.bitwise_count(words).sum())
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        return int(_BYTE_COUNTS[words.view(np.uint8)].sum())
+
+
+class RiskFactorBitsets:
+    """Packed bitsets for every risk factor plus the CVD outcome"""
+
+    def __init__(self, df, factors=RISK_FACTORS):
+        self.n = len(df)
+        self.names = list(factors)
+        self.bits = {name: pack(fn(df).fillna(False)) for name, fn in factors.items()}
+        self.cvd = pack(cvd_mask(df))
+        # Needed so NOT does not set the padding bits
+        self.all = pack(np.ones(self.n, dtype=bool))
+
+    @classmethod
+    def from_csv(cls, path=CVD_DATA):
+        return cls(pd.read_csv(path))
+
+    def intersect(self, include, exclude=()):
+        words = self.all.copy()
+        for name in include:
+            words &= self.bits[name]
+        for name in exclude:
+            words &= ~self.bits[name]
+        return words
+
+    def count(self, words):
+        """(patients, CVD cases) in a bitset"""
+        return popcount(words), popcount(words & self.cvd)
+
+    # ============================================
+    # ANALYSES
+    # ============================================
+    def pair_matrix(self):
+        """Long-format pair table: count, CVD prevalence and lift (observed / expected)"""
+        singles = {name: popcount(self.bits[name]) for name in self.names}
+        rows = []
+        for a in self.names:
+            for b in self.names:
+                words = self.bits[a] & self.bits[b]
+                count, cases = self.count(words)
+                expected = singles[a] * singles[b] / self.n if a != b else singles[a]
+                rows.append({
+                    "factor_a": a,
+                    "factor_b": b,
+                    "count": count,
+                    "cvd_prevalence": cases / count * 100 if count else np.nan,
+                    "lift": count / expected if expected else np.nan,
+                })
+        return pd.DataFrame(rows)
+
+    def combination_table(self, min_order=1, max_order=None, exclusive=True, min_count=1):
+        """
+        Counts for every factor combination.
+
+        exclusive=True gives UpSet-style cells (exactly these factors and no
+        others); exclusive=False counts patients having at least these factors.
+        """
+        max_order = max_order or len(self.names)
+        rows = []
+        for order in range(min_order, max_order + 1):
+            for combo in combinations(self.names, order):
+                exclude = [n for n in self.names if n not in combo] if exclusive else ()
+                count, cases = self.count(self.intersect(combo, exclude))
+                if count < min_count:
+                    continue
+                rows.append({
+                    "factors": combo,
+                    "order": order,
+                    "count": count,
+                    "cvd_prevalence": cases / count * 100 if count else np.nan,
+                })
+        table = pd.DataFrame(rows)
+        if len(table):
+            table = table.sort_values("count", ascending=False, ignore_index=True)
+        return table
+
+    def factor_count_distribution(self):
+        """Patients by number of risk factors present, with CVD prevalence"""
+        table = self.combination_table(min_order=0, exclusive=True, min_count=0)
+        rows = []
+        for order in range(len(self.names) + 1):
+            subset = table[table["order"] == order]
+            count = int(subset["count"].sum())
+            cases = float((subset["count"] * subset["cvd_prevalence"].fillna(0)).sum() / 100)
+            rows.append({
+                "risk_factors": order,
+                "count": count,
+                "cvd_prevalence": cases / count * 100 if count else np.nan,
+            })
+        return pd.DataFrame(rows)
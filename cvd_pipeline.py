@@ -0,0 +1,233 @@
+"""
+Vectorized ingest pipeline for Bangladesh CVD registry exports.
+
+Normalizes files shaped like data/CVD Dataset.csv: splits the
+"125/79" blood pressure reading, back-fills raw measurements that can be
+recovered from derived columns, imputes the rest with per-sex means, and
+recomputes every derived column so they stay consistent:
+
+    Height (cm)            = Height (m) * 100
+    BMI                    = Weight / Height (m)^2
+    Waist-to-Height Ratio  = Abdominal Circumference / Height (cm)
+    Systolic/Diastolic BP  = split of Blood Pressure (mmHg)
+    Blood Pressure Category  (2017 ACC/AHA thresholds)
+    Estimated LDL          = max(Total Cholesterol - HDL - 30, 0)
+    CVD Risk Score         = 0.2 BMI + 0.05 Systolic + 0.02 Total Chol + 2 (if diabetic)
+
+All operations are column-wise NumPy/pandas; the file is streamed in
+chunks (one pass for imputation statistics, one to transform).
+
+Usage:
+    python cvd_pipeline.py "data/CVD Dataset.csv" data/cvd_normalized.csv
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+CHUNKSIZE = 250_000
+
+# Raw measurements imputed when they cannot be recovered from derived columns
+RAW_COLUMNS = [
+    "Age",
+    "Weight (kg)",
+    "Height (m)",
+    "Abdominal Circumference (cm)",
+    "Total Cholesterol (mg/dL)",
+    "HDL (mg/dL)",
+    "Fasting Blood Sugar (mg/dL)",
+    "Systolic BP",
+    "Diastolic BP",
+]
+
+# Decimal places used in the source file
+ROUNDING = {
+    "Age": 0,
+    "Weight (kg)": 1,
+    "Height (m)": 2,
+    "Abdominal Circumference (cm)": 1,
+    "Total Cholesterol (mg/dL)": 0,
+    "HDL (mg/dL)": 0,
+    "Fasting Blood Sugar (mg/dL)": 0,
+    "Systolic BP": 0,
+    "Diastolic BP": 0,
+    "Height (cm)": 1,
+    "BMI": 1,
+    "Waist-to-Height Ratio": 3,
+    "Estimated LDL (mg/dL)": 0,
+    "CVD Risk Score": 2,
+}
+
+BP_CATEGORIES = ["Normal", "Elevated", "Hypertension Stage 1", "Hypertension Stage 2"]
+BP_PATTERN = r"^\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*$"
+
+# Column layout of data/CVD Dataset.csv; raw exports may lack the derived ones
+OUTPUT_COLUMNS = [
+    "Sex", "Age", "Weight (kg)", "Height (m)", "BMI", "Abdominal Circumference (cm)",
+    "Blood Pressure (mmHg)", "Total Cholesterol (mg/dL)", "HDL (mg/dL)",
+    "Fasting Blood Sugar (mg/dL)", "Smoking Status", "Diabetes Status",
+    "Physical Activity Level", "Family History of CVD", "CVD Risk Level",
+    "Height (cm)", "Waist-to-Height Ratio", "Systolic BP", "Diastolic BP",
+    "Blood Pressure Category", "Estimated LDL (mg/dL)", "CVD Risk Score",
+]
+
+
+def ensure_columns(df):
+    """Add any missing output column as all-NaN so every transform can rely on it"""
+    missing = [c for c in OUTPUT_COLUMNS if c not in df.columns]
+    if missing:
+        df = df.assign(**dict.fromkeys(missing, np.nan))
+    return df
+
+
+# ============================================
+# IMPUTATION STATISTICS
+# ============================================
+def fit_imputation(path, chunksize=CHUNKSIZE):
+    """Per-sex means of the raw measurements, accumulated chunk by chunk"""
+    sums = None
+    counts = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk = split_blood_pressure(backfill_raw(ensure_columns(chunk)))
+        grouped = chunk.groupby("Sex")[RAW_COLUMNS]
+        chunk_sums, chunk_counts = grouped.sum(min_count=1).fillna(0), grouped.count()
+        sums = chunk_sums if sums is None else sums.add(chunk_sums, fill_value=0)
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+    means = sums / counts.replace(0, np.nan)
+    overall = sums.sum() / counts.sum().replace(0, np.nan)
+    return {"by_sex": means, "overall": overall}
+
+
+# ============================================
+# TRANSFORMS
+# ============================================
+def split_blood_pressure(df):
+    """Systolic/Diastolic from "125/79", and the reading rebuilt from them if missing"""
+    df = df.copy()
+    # One anchored regex per reading: anything that is not exactly
+    # "<number>/<number>" gives NaN for both parts instead of a shifted row
+    parts = df["Blood Pressure (mmHg)"].astype(str).str.extract(BP_PATTERN)
+    systolic = pd.to_numeric(parts[0], errors="coerce")
+    diastolic = pd.to_numeric(parts[1], errors="coerce")
+    df["Systolic BP"] = systolic.fillna(df["Systolic BP"])
+    df["Diastolic BP"] = diastolic.fillna(df["Diastolic BP"])
+    return df
+
+
+def backfill_raw(df):
+    """Recover raw measurements from derived columns where the formula is invertible"""
+    df = df.copy()
+    height_m = df["Height (m)"].fillna(df["Height (cm)"] / 100)
+    df["Height (m)"] = height_m
+    df["Weight (kg)"] = df["Weight (kg)"].fillna(df["BMI"] * height_m ** 2)
+    df["Abdominal Circumference (cm)"] = df["Abdominal Circumference (cm)"].fillna(
+        df["Waist-to-Height Ratio"] * height_m * 100
+    )
+    # LDL is clipped at 0, so only positive values can be inverted
+    ldl = df["Estimated LDL (mg/dL)"].where(df["Estimated LDL (mg/dL)"] > 0)
+    df["Total Cholesterol (mg/dL)"] = df["Total Cholesterol (mg/dL)"].fillna(
+        ldl + df["HDL (mg/dL)"] + 30
+    )
+    df["HDL (mg/dL)"] = df["HDL (mg/dL)"].fillna(df["Total Cholesterol (mg/dL)"] - ldl - 30)
+    return df
+
+
+def impute(df, stats):
+    """Fill remaining raw gaps with the per-sex mean (overall mean as fallback)"""
+    df = df.copy()
+    by_sex = stats["by_sex"].reindex(columns=RAW_COLUMNS)
+    fill = by_sex.reindex(df["Sex"]).set_axis(df.index)
+    fill = fill.fillna(stats["overall"].reindex(RAW_COLUMNS))
+    imputed = {}
+    for column in RAW_COLUMNS:
+        missing = df[column].isna()
+        imputed[column] = int(missing.sum())
+        df[column] = df[column].fillna(fill[column].round(ROUNDING[column]))
+    return df, imputed
+
+
+def blood_pressure_category(systolic, diastolic):
+    """2017 ACC/AHA categories, vectorized"""
+    conditions = [
+        (systolic >= 140) | (diastolic >= 90),
+        (systolic >= 130) | (diastolic >= 80),
+        systolic >= 120,
+    ]
+    codes = np.select(conditions, [3, 2, 1], default=0)
+    return pd.Categorical.from_codes(codes, categories=BP_CATEGORIES)
+
+
+def recompute_derived(df):
+    """Recompute every derived column from the (now complete) raw columns"""
+    df = df.copy()
+    height_m = df["Height (m)"]
+    systolic = df["Systolic BP"]
+    diastolic = df["Diastolic BP"]
+    total_chol = df["Total Cholesterol (mg/dL)"]
+
+    df["Height (cm)"] = height_m * 100
+    df["BMI"] = df["Weight (kg)"] / height_m ** 2
+    df["Waist-to-Height Ratio"] = df["Abdominal Circumference (cm)"] / df["Height (cm)"]
+    df["Blood Pressure (mmHg)"] = (
+        systolic.round().astype("Int64").astype("string") + "/"
+        + diastolic.round().astype("Int64").astype("string")
+    )
+    df["Blood Pressure Category"] = blood_pressure_category(systolic.to_numpy(), diastolic.to_numpy())
+    df["Estimated LDL (mg/dL)"] = (total_chol - df["HDL (mg/dL)"] - 30).clip(lower=0)
+    df["CVD Risk Score"] = (
+        0.2 * df["BMI"] + 0.05 * systolic + 0.02 * total_chol
+        + 2.0 * (df["Diabetes Status"] == "Y")
+    )
+    for column in ["Height (cm)", "BMI", "Waist-to-Height Ratio", "Estimated LDL (mg/dL)", "CVD Risk Score"]:
+        df[column] = df[column].round(ROUNDING[column])
+    return df
+
+
+def normalize_chunk(df, stats):
+    """Full transform for one chunk; returns (frame, imputed counts)"""
+    df = backfill_raw(split_blood_pressure(ensure_columns(df)))
+    df, imputed = impute(df, stats)
+    return recompute_derived(df), imputed
+
+
+# ============================================
+# PIPELINE
+# ============================================
+def run_pipeline(src, dst, chunksize=CHUNKSIZE, stats=None):
+    """Stream src through the pipeline into dst; returns a summary dict"""
+    started = time.perf_counter()
+    stats = stats or fit_imputation(src, chunksize)
+    rows = 0
+    imputed_total = dict.fromkeys(RAW_COLUMNS, 0)
+    for i, chunk in enumerate(pd.read_csv(src, chunksize=chunksize)):
+        out, imputed = normalize_chunk(chunk, stats)
+        out[OUTPUT_COLUMNS].to_csv(dst, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows += len(out)
+        for column, count in imputed.items():
+            imputed_total[column] += count
+    return {
+        "rows": rows,
+        "imputed": imputed_total,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize a Bangladesh CVD registry export")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    summary = run_pipeline(args.src, args.dst, args.chunksize)
+    print(f"Normalized {summary['rows']:,} rows in {summary['seconds']:.2f}s -> {args.dst}")
+    for column, count in summary["imputed"].items():
+        if count:
+            print(f"  imputed {count:,} x {column}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Streaming input drift monitor for the clinical model.
+
+Keeps a fixed-size histogram sketch per clinical feature, plus one for the
+predicted probability, over a rolling window of recent predictions. The
+sketches are compared with the training cohort
+(data/heart_disease_clean.csv) using PSI and a binned KS statistic.
+
+Memory is features x bins x slots counters regardless of how many
+predictions have been scored. An update costs one searchsorted per
+feature.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+REFERENCE_DATA = "data/heart_disease_clean.csv"
+
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 major shift
+PSI_MODERATE = 0.1
+PSI_MAJOR = 0.25
+
+
+def _inner_edges(values, max_bins):
+    """Bin boundaries: category midpoints for discrete features, quantiles otherwise"""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    uniques = np.unique(values)
+    if len(uniques) <= max_bins:
+        return (uniques[:-1] + uniques[1:]) / 2
+    quantiles = np.quantile(values, np.linspace(0, 1, max_bins + 1)[1:-1])
+    return np.unique(quantiles)
+
+
+def _bin(edges, value):
+    return int(np.searchsorted(edges, value, side="right"))
+
+
+def psi(expected, actual, eps=1e-4):
+    """Population stability index between two count vectors"""
+    e = np.asarray(expected, dtype=float)
+    a = np.asarray(actual, dtype=float)
+    e = np.clip(e / max(e.sum(), 1), eps, None)
+    a = np.clip(a / max(a.sum(), 1), eps, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_binned(expected, actual):
+    """Kolmogorov-Smirnov distance on binned CDFs"""
+    e = np.cumsum(expected) / max(np.sum(expected), 1)
+    a = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(e - a)))
+
+
+class DriftMonitor:
+    """Rolling-window histogram sketches compared against the training cohort"""
+
+    def __init__(self, features, reference_data=REFERENCE_DATA, model=None,
+                 window=500, slots=10, max_bins=10, min_samples=30):
+        self.features = list(features)
+        self.window = window
+        self.slots = slots
+        self.slot_size = max(window // slots, 1)
+        self.min_samples = min_samples
+
+        reference = pd.read_csv(reference_data)[self.features].astype(float)
+
+        # Sketch layout: one row of bins per feature, the last row is the probability
+        self.edges = [_inner_edges(reference[f], max_bins) for f in self.features]
+        self.edges.append(np.linspace(0, 1, max_bins + 1)[1:-1])
+        self.names = self.features + ["probability"]
+
+        self.reference = [
+            np.bincount(np.searchsorted(edges, reference[f].to_numpy(), side="right"),
+                        minlength=len(edges) + 1)
+            for f, edges in zip(self.features, self.edges)
+        ]
+        if model is not None:
+            ref_prob = model.predict_proba(reference)[:, 1]
+            self.reference.append(
+                np.bincount(np.searchsorted(self.edges[-1], ref_prob, side="right"),
+                            minlength=len(self.edges[-1]) + 1)
+            )
+        else:
+            self.reference.append(None)
+
+        width = max(len(edges) + 1 for edges in self.edges)
+        # slots x sketches x bins; each slot holds slot_size consecutive predictions
+        self._counts = np.zeros((slots, len(self.names), width), dtype=np.int64)
+        self._slot = 0
+        self._in_slot = 0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def update(self, inputs, probability=None):
+        """Add one scored patient (dict keyed by feature name)"""
+        bins = [_bin(edges, inputs[f]) for f, edges in zip(self.features, self.edges)]
+        if probability is not None:
+            bins.append(_bin(self.edges[-1], probability))
+
+        with self._lock:
+            if self._in_slot >= self.slot_size:
+                # Oldest slot falls out of the window
+                self._slot = (self._slot + 1) % self.slots
+                self._counts[self._slot] = 0
+                self._in_slot = 0
+            counts = self._counts[self._slot]
+            counts[np.arange(len(bins)), bins] += 1
+            self._in_slot += 1
+            self.total += 1
+
+    def report(self):
+        """PSI/KS per sketch over the current window as a DataFrame"""
+        with self._lock:
+            window = self._counts.sum(axis=0)
+        rows = []
+        for i, name in enumerate(self.names):
+            expected = self.reference[i]
+            if expected is None:
+                continue
+            actual = window[i, :len(expected)]
+            n = int(actual.sum())
+            if n < self.min_samples:
+                value_psi = value_ks = np.nan
+                status = "warming up"
+            else:
+                value_psi = psi(expected, actual)
+                value_ks = ks_binned(expected, actual)
+                if value_psi > PSI_MAJOR:
+                    status = "major shift"
+                elif value_psi > PSI_MODERATE:
+                    status = "moderate shift"
+                else:
+                    status = "stable"
+            rows.append({"feature": name, "window_n": n, "psi": value_psi,
+                         "ks": value_ks, "status": status})
+        return pd.DataFrame(rows)
@@ -0,0 +1,346 @@
+"""
+Static snapshot export of the Home and Bangladesh Insights pages.
+
+Both pages are read-only views of insights/*.json, the insight PNGs and
+the Bangladesh dataset. This script renders them through app.py with
+Streamlit's AppTest, then writes the element tree to self-contained
+HTML. Plotly charts are embedded as JSON and drawn by a bundled
+plotly.min.js, and images are copied beside the pages. Any static file
+server can host the result, so Streamlit only has to serve the Clinical
+Diagnosis page.
+
+Interactive widgets (the age/gender explorer, heatmap metric) are shown
+at their default selection with a pointer to the live app.
+
+Usage:
+    python export_static.py --out site            # skips if inputs are unchanged
+    python export_static.py --out site --force --live-url https://<your-app>.streamlit.app
+"""
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import warnings
+from contextlib import contextmanager
+from unittest import mock
+
+from streamlit.proto.Block_pb2 import Block as BlockProto
+from streamlit.proto.Metric_pb2 import Metric as MetricProto
+
+APP_PATH = "app.py"
+OUT_DIR = "site"
+
+PAGES = [
+    ("index.html", "🏠 Home"),
+    ("insights.html", "🇧🇩 Bangladesh CVD Insights"),
+]
+
+# Everything the two pages are rendered from, including this renderer
+INPUTS = ["app.py", "cooccurrence.py", "export_static.py", "insights/*", "data/CVD Dataset.csv"]
+
+BASE_CSS = """
+body { margin: 0; font-family: "Source Sans Pro", -apple-system, "Segoe UI", sans-serif; }
+.stApp { min-height: 100vh; }
+nav { display: flex; gap: 24px; padding: 16px 32px; background: #0f3460; }
+nav a { color: #00d9ff; font-weight: 600; text-decoration: none; }
+nav a.live { margin-left: auto; }
+.block-container { max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
+.row { display: flex; gap: 16px; }
+.col { min-width: 0; }
+.metric-label { font-size: 1.1rem; }
+.metric-value { font-size: 2.5rem; font-weight: 700; color: #00d9ff; }
+.metric-delta { font-size: 0.95rem; }
+.metric-delta.green { color: #10b981 !important; }
+.metric-delta.red { color: #ef4444 !important; }
+.alert { padding: 16px; border-radius: 10px; margin: 12px 0; border-left: 4px solid #00d9ff;
+         background-color: rgba(15, 52, 96, 0.8); }
+.alert.warning { background-color: rgba(245, 158, 11, 0.2); border-left-color: #f59e0b; }
+.alert.error { background-color: rgba(239, 68, 68, 0.2); border-left-color: #ef4444; }
+.alert.success { background-color: rgba(16, 185, 129, 0.2); border-left-color: #10b981; }
+.caption, .widget-note { color: #b8b8b8 !important; font-size: 0.9rem; }
+img { max-width: 100%; }
+hr { border: none; border-top: 1px solid rgba(0, 217, 255, 0.3); margin: 24px 0; }
+"""
+
+
+# ============================================
+# MARKDOWN
+# ============================================
+def _inline(text):
+    text = html.escape(text, quote=False)
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+
+
+def markdown_to_html(text):
+    """The Markdown subset used by app.py: headings, rules, lists, bold, hard breaks, raw HTML"""
+    out = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        lines = [line.strip() for line in block.splitlines()]
+        first = lines[0] if lines else ""
+        if first.startswith("<"):
+            out.append(block)
+        elif first == "---":
+            out.append("<hr>")
+        elif re.match(r"#{1,6} ", first):
+            level = len(first.split(" ", 1)[0])
+            out.append(f"<h{level}>{_inline(first[level + 1:])}</h{level}>")
+            if lines[1:]:
+                out.append(markdown_to_html("\n".join(lines[1:])))
+        elif all(line.startswith("- ") for line in lines):
+            out.append("<ul>" + "".join(f"<li>{_inline(line[2:])}</li>" for line in lines) + "</ul>")
+        else:
+            raw = block.splitlines()
+            parts = []
+            for i, line in enumerate(raw):
+                parts.append(_inline(line.strip()))
+                if i < len(raw) - 1:
+                    parts.append("<br>" if line.endswith("  ") else " ")
+            out.append("<p>" + "".join(parts) + "</p>")
+    return "\n".join(out)
+
+
+# ============================================
+# RENDERING
+# ============================================
+@contextmanager
+def capture_media():
+    """Record bytes for every st.image so the snapshot can ship them"""
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    media = {}
+    original = MemoryMediaFileStorage.load_and_get_id
+
+    def load_and_get_id(self, path_or_data, mimetype, kind, filename=None):
+        file_id = original(self, path_or_data, mimetype, kind, filename)
+        data = path_or_data
+        if isinstance(path_or_data, str):
+            with open(path_or_data, "rb") as f:
+                data = f.read()
+        media[file_id] = bytes(data)
+        return file_id
+
+    with mock.patch.object(MemoryMediaFileStorage, "load_and_get_id", load_and_get_id):
+        yield media
+
+
+def render_page(page, app_path=APP_PATH, timeout=120):
+    """Run app.py headlessly on one page and return its main element tree"""
+    from streamlit.testing.v1 import AppTest
+
+    # app.py skips its background threads and audit database for an export
+    os.environ["STATIC_EXPORT"] = "1"
+    at = AppTest.from_file(app_path, default_timeout=timeout).run()
+    radio = at.sidebar.radio[0]
+    if radio.value != page:
+        radio.set_value(page).run()
+    if len(at.exception):
+        raise RuntimeError(f"{page} failed to render: {at.exception[0].message}")
+    return at.main
+
+
+class SnapshotWriter:
+    """Turns an AppTest element tree into static HTML"""
+
+    def __init__(self, out_dir, media, live_url=None):
+        self.out_dir = out_dir
+        self.media = media
+        self.live_url = live_url
+        self.css = []
+        self._chart_id = 0
+
+    def render(self, node):
+        kind = getattr(node, "type", None)
+        handler = getattr(self, f"_render_{kind}", None)
+        if handler is not None:
+            return handler(node)
+        children = getattr(node, "children", None)
+        if isinstance(children, dict):
+            return "\n".join(self.render(child) for child in children.values())
+        return ""
+
+    def _render_markdown(self, node):
+        body = node.proto.body
+        if body.lstrip().startswith("<style>"):
+            self.css.append(re.sub(r"</?style>", "", body))
+            return ""
+        return markdown_to_html(body)
+
+    def _render_caption(self, node):
+        return f"<p class='caption'>{_inline(node.proto.body)}</p>"
+
+    def _alert(self, node, kind):
+        return f"<div class='alert {kind}'>{markdown_to_html(node.proto.body)}</div>"
+
+    def _render_info(self, node):
+        return self._alert(node, "info")
+
+    def _render_warning(self, node):
+        return self._alert(node, "warning")
+
+    def _render_error(self, node):
+        return self._alert(node, "error")
+
+    def _render_success(self, node):
+        return self._alert(node, "success")
+
+    def _render_metric(self, node):
+        proto = node.proto
+        color = {MetricProto.RED: "red", MetricProto.GREEN: "green"}.get(proto.color, "")
+        delta = f"<div class='metric-delta {color}'>{_inline(proto.delta)}</div>" if proto.delta else ""
+        return (
+            "<div class='metric'>"
+            f"<div class='metric-label'>{_inline(proto.label)}</div>"
+            f"<div class='metric-value'>{_inline(proto.body)}</div>"
+            f"{delta}</div>"
+        )
+
+    def _render_image(self, node):
+        tags = []
+        for img in node.proto.imgs:
+            file_id = os.path.splitext(os.path.basename(img.url))[0]
+            data = self.media.get(file_id)
+            if data is None:
+                continue
+            name = os.path.basename(img.url)
+            with open(os.path.join(self.out_dir, "assets", name), "wb") as f:
+                f.write(data)
+            tags.append(f"<img src='assets/{name}' alt='{html.escape(img.caption)}'>")
+        return "\n".join(tags)
+
+    def _render_plotly_chart(self, node):
+        self._chart_id += 1
+        chart_id = f"chart-{self._chart_id}"
+        spec = json.loads(node.proto.spec)
+        payload = json.dumps({"data": spec.get("data", []), "layout": spec.get("layout", {})})
+        # Keep "</script>" inside the JSON from closing the tag early
+        payload = payload.replace("</", "<\\/")
+        return (
+            f"<div id='{chart_id}' class='chart'></div>"
+            f"<script>(function(){{var s={payload};"
+            f"Plotly.newPlot('{chart_id}', s.data, s.layout, {{responsive: true, displaylogo: false}});}})();</script>"
+        )
+
+    def _render_flex_container(self, node):
+        inner = "\n".join(self.render(child) for child in node.children.values())
+        if node.proto.flex_container.direction == BlockProto.FlexContainer.HORIZONTAL:
+            return f"<div class='row'>{inner}</div>"
+        return inner
+
+    def _render_column(self, node):
+        inner = "\n".join(self.render(child) for child in node.children.values())
+        return f"<div class='col' style='flex: {node.proto.weight:.4f}'>{inner}</div>"
+
+    def _render_tab(self, node):
+        inner = "\n".join(self.render(child) for child in node.children.values())
+        return f"<h4>{_inline(node.label)}</h4>{inner}"
+
+    def _render_expander(self, node):
+        inner = "\n".join(self.render(child) for child in node.children.values())
+        return f"<details><summary>{_inline(node.label)}</summary>{inner}</details>"
+
+    def _widget_note(self, node):
+        label = _inline(getattr(node, "label", "") or "")
+        live_app = f"<a href='{self.live_url}'>live app</a>" if self.live_url else "live app"
+        return f"<p class='widget-note'>🔗 <em>{label}</em> can be changed in the {live_app}.</p>"
+
+    _render_selectbox = _widget_note
+    _render_radio = _widget_note
+    _render_number_input = _widget_note
+    _render_button = _widget_note
+
+
+def page_html(title, body, css, current, live_url=None):
+    links = []
+    for filename, label in PAGES:
+        aria = " aria-current='page'" if filename == current else ""
+        links.append(f"<a href='{filename}'{aria}>{label}</a>")
+    if live_url:
+        links.append(f"<a class='live' href='{live_url}'>🏥 Clinical Diagnosis (live app)</a>")
+    nav = "".join(links)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} | Heart Disease Risk Assessment | Bangladesh</title>
+<script src="plotly.min.js"></script>
+<style>{BASE_CSS}
+{css}</style>
+</head>
+<body class="stApp">
+<nav>{nav}</nav>
+<main class="block-container">
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+# ============================================
+# EXPORT
+# ============================================
+def inputs_fingerprint(patterns=INPUTS, options=()):
+    """Hash of the input files plus export options and library versions"""
+    import plotly
+    import streamlit
+
+    digest = hashlib.sha256()
+    # The element tree and the bundled plotly.js depend on these versions
+    for value in (streamlit.__version__, plotly.__version__, *options):
+        digest.update(f"{value}\0".encode())
+    for path in sorted(p for pattern in patterns for p in glob.glob(pattern)):
+        digest.update(path.encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def export(out_dir=OUT_DIR, force=False, app_path=APP_PATH, live_url=None):
+    """Write the snapshot bundle; returns False if it was already up to date"""
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    fingerprint = inputs_fingerprint(INPUTS + [app_path], options=(app_path, live_url))
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f).get("fingerprint") == fingerprint:
+                return False
+
+    os.makedirs(os.path.join(out_dir, "assets"), exist_ok=True)
+    import plotly.offline
+    with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as f:
+        f.write(plotly.offline.get_plotlyjs())
+
+    for filename, page in PAGES:
+        with capture_media() as media:
+            tree = render_page(page, app_path)
+        writer = SnapshotWriter(out_dir, media, live_url)
+        body = writer.render(tree)
+        with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+            f.write(page_html(page, body, "\n".join(writer.css), filename, live_url))
+
+    with open(manifest_path, "w") as f:
+        json.dump({"fingerprint": fingerprint, "pages": [p[0] for p in PAGES]}, f, indent=2)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export static Home and Insights pages")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--force", action="store_true", help="export even if inputs are unchanged")
+    parser.add_argument("--live-url", help="URL of the Streamlit deployment, linked for interactive parts")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    if export(args.out, args.force, live_url=args.live_url):
+        print(f"Exported {len(PAGES)} pages to {args.out}/")
+    else:
+        print(f"{args.out}/ is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
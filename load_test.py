@@ -0,0 +1,397 @@
+"""
+Load test for app.py against one real Streamlit server.
+
+Starts a single `streamlit run app.py` process and drives N simulated
+clinicians against it over the same websocket protocol the browser
+uses. Each session visits the three pages, changes the age/gender
+explorer selectboxes, fills the 13 clinical inputs and presses Run
+Diagnostic. Every widget change is a script rerun, timed from the
+BackMsg leaving the client to the server's script_finished.
+
+Concurrency is ramped level by level. For each level the server PID's
+CPU time and peak RSS are read from /proc (Linux), and capacity is the
+highest level whose p90 latency and error rate stay under the limits.
+
+Usage:
+    python load_test.py --levels 1 2 4 8 --sessions 2 --max-p90-ms 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP_PATH = "app.py"
+NAV_LABEL = "Choose Assessment Type"
+PAGES = ["🏠 Home", "🇧🇩 Bangladesh CVD Insights", "🏥 Clinical Diagnosis"]
+CLINICAL_INPUTS = [
+    "Chest Pain Type", "Maximum Heart Rate (bpm)", "ST Depression", "ST Slope",
+    "Major Vessels (ca)", "Thalassemia", "Exercise Induced Angina", "Resting ECG",
+    "Age", "Sex", "Resting Blood Pressure (mmHg)", "Serum Cholesterol (mg/dL)",
+    "Fasting Blood Sugar > 120 mg/dL",
+]
+DIAGNOSE_LABEL = "🔬 Run Diagnostic"
+WIDGET_TYPES = ("radio", "selectbox", "number_input", "button")
+
+
+# ============================================
+# SERVER
+# ============================================
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_path, port, startup_timeout=60.0):
+    """Launch `streamlit run` and wait for its health check; returns the Popen"""
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_path,
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            log.seek(0)
+            tail = log.read().decode(errors="replace").strip().splitlines()[-5:]
+            raise RuntimeError(f"server exited with code {proc.returncode}:\n" + "\n".join(tail))
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"server did not become healthy within {startup_timeout:.0f}s")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def server_cpu_seconds(pid):
+    """utime + stime of the server process"""
+    with open(f"/proc/{pid}/stat") as f:
+        # Fields after the parenthesised command name; utime/stime are 14 and 15
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def server_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+# ============================================
+# CLIENT
+# ============================================
+class Client:
+    """One browser tab: a websocket session that keeps widget state like the frontend"""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.widgets = {}   # (kind, label) -> element proto from the last run
+        self.states = {}    # widget id -> WidgetState sent on every rerun
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def widget(self, kind, label):
+        try:
+            return self.widgets[(kind, label)]
+        except KeyError:
+            raise LookupError(f"Widget not found: {label}") from None
+
+    def set_value(self, kind, label, value):
+        proto = self.widget(kind, label)
+        state = WidgetState(id=proto.id)
+        if kind in ("radio", "selectbox"):
+            state.string_value = value
+        elif kind == "number_input" and proto.data_type == NumberInput.INT:
+            state.int_value = int(value)
+        else:
+            state.double_value = float(value)
+        self.states[proto.id] = state
+
+    def click(self, label):
+        proto = self.widget("button", label)
+        self.states[proto.id] = WidgetState(id=proto.id, trigger_value=True)
+
+    async def rerun(self):
+        """Send the current widget states and wait for the run to finish; returns an error or None"""
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        await self.ws.send(msg.SerializeToString())
+        # Triggers fire once, as a button click does in the browser
+        self.states = {i: s for i, s in self.states.items() if not s.HasField("trigger_value")}
+        return await asyncio.wait_for(self._read_run(), self.timeout)
+
+    async def _read_run(self):
+        widgets = {}
+        error = None
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in WIDGET_TYPES:
+                    proto = getattr(element, element_type)
+                    widgets[(element_type, proto.label)] = proto
+                elif element_type == "exception" and error is None:
+                    error = f"{element.exception.type}: {element.exception.message}"
+            elif kind == "script_finished":
+                status = msg.script_finished
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    error = error or "script failed to compile"
+                break
+        self.widgets = widgets
+        # The frontend forgets state for widgets that are no longer on the page
+        live = {proto.id for proto in widgets.values()}
+        self.states = {i: s for i, s in self.states.items() if i in live}
+        return error
+
+
+# ============================================
+# SCENARIO
+# ============================================
+def _random_value(proto, rng):
+    if hasattr(proto, "options"):
+        return rng.choice(list(proto.options))
+    if proto.data_type == NumberInput.INT:
+        return rng.randint(int(proto.min), int(proto.max))
+    steps = int(round((proto.max - proto.min) / (proto.step or 0.1)))
+    return proto.min + rng.randint(0, steps) * (proto.step or 0.1)
+
+
+def _choose(kind, label, rng):
+    def action(client):
+        client.set_value(kind, label, _random_value(client.widget(kind, label), rng))
+    return action
+
+
+def session_steps(rng):
+    """Yield (step name, action) pairs; each action changes one widget"""
+    yield "home", lambda client: None
+    yield "nav_insights", lambda client: client.set_value("radio", NAV_LABEL, PAGES[1])
+    yield "explorer_age", _choose("selectbox", "Select Age Group", rng)
+    yield "explorer_gender", _choose("selectbox", "Select Gender", rng)
+    yield "nav_clinical", lambda client: client.set_value("radio", NAV_LABEL, PAGES[2])
+    for label in CLINICAL_INPUTS:
+        # Look the widget up at run time: its kind comes from the page itself
+        yield f"input:{label}", lambda client, label=label: _choose(
+            "selectbox" if ("selectbox", label) in client.widgets else "number_input", label, rng
+        )(client)
+    yield "diagnose", lambda client: client.click(DIAGNOSE_LABEL)
+    yield "nav_home", lambda client: client.set_value("radio", NAV_LABEL, PAGES[0])
+
+
+async def run_session(url, rng, think_time, timeout):
+    """Play one clinician session in a fresh tab; return a list of step samples"""
+    client = Client(url, timeout)
+    samples = []
+    try:
+        await client.connect()
+        for step, action in session_steps(rng):
+            started = time.perf_counter()
+            try:
+                action(client)
+                error = await client.rerun()
+            except asyncio.TimeoutError:
+                error = f"timed out after {timeout:.0f}s"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            samples.append({
+                "step": step,
+                "latency_ms": (time.perf_counter() - started) * 1000,
+                "error": error,
+            })
+            if error and not client.widgets:
+                # Nothing rendered, so there is nothing left to click
+                break
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+    except Exception as e:
+        samples.append({"step": "connect", "latency_ms": 0.0, "error": f"{type(e).__name__}: {e}"})
+    finally:
+        await client.close()
+    return samples
+
+
+# ============================================
+# LEVELS
+# ============================================
+async def _sample_rss(pid, peak, stop):
+    while not stop.is_set():
+        peak[0] = max(peak[0], server_rss_mb(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.2)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(concurrency, url, pid, sessions, think_time, timeout, seed):
+    """Run `concurrency` simultaneous clinicians against the server and summarise"""
+    rngs = [random.Random(seed * 1000 + concurrency * 100 + i) for i in range(concurrency)]
+
+    async def clinician(rng):
+        samples = []
+        for _ in range(sessions):
+            samples.extend(await run_session(url, rng, think_time, timeout))
+        return samples
+
+    peak, stop = [server_rss_mb(pid)], asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(pid, peak, stop))
+    cpu_before = server_cpu_seconds(pid)
+    started = time.perf_counter()
+    per_client = await asyncio.gather(*(clinician(rng) for rng in rngs))
+    wall = time.perf_counter() - started
+    cpu = server_cpu_seconds(pid) - cpu_before
+    stop.set()
+    await sampler
+    samples = [s for client_samples in per_client for s in client_samples]
+    return summarise(concurrency, samples, wall, cpu, peak[0])
+
+
+def summarise(concurrency, samples, wall, cpu, max_rss_mb):
+    latencies = np.array([s["latency_ms"] for s in samples])
+    errors = sum(1 for s in samples if s["error"])
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if len(latencies) else (0, 0, 0)
+    diag = [s["latency_ms"] for s in samples if s["step"] == "diagnose"]
+    by_step = {}
+    for s in samples:
+        by_step.setdefault(s["step"], []).append(s["latency_ms"])
+    slowest = sorted(by_step, key=lambda step: np.mean(by_step[step]), reverse=True)[:3]
+    return {
+        "concurrency": concurrency,
+        "reruns": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "diagnose_p90_ms": float(np.percentile(diag, 90)) if diag else 0.0,
+        "throughput_rps": len(samples) / wall if wall else 0.0,
+        "server_cpu_seconds": cpu,
+        # Cores the server kept busy on average; ~1.0 is one saturated core
+        "server_cpu_cores": cpu / wall if wall else 0.0,
+        "server_cpu_ms_per_rerun": cpu * 1000 / len(samples) if samples else 0.0,
+        "server_max_rss_mb": max_rss_mb,
+        "slowest_steps": {step: float(np.mean(by_step[step])) for step in slowest},
+        "error_samples": sorted({s["error"] for s in samples if s["error"]})[:5],
+    }
+
+
+def within_limits(level, max_p90_ms, max_error_rate):
+    return level["p90_ms"] <= max_p90_ms and level["error_rate"] <= max_error_rate
+
+
+async def ramp(args, url, pid):
+    # Warm-up session: imports, model loading and st.cache_* are not measured
+    await run_session(url, random.Random(args.seed), 0, args.timeout)
+
+    levels = []
+    capacity = 0
+    print(f"{'users':>5} {'reruns':>6} {'err%':>5} {'p50':>7} {'p90':>7} {'p99':>7} "
+          f"{'rps':>6} {'cpu/rerun':>9} {'cores':>5} {'rss MB':>7}")
+    for concurrency in args.levels:
+        lvl = await run_level(concurrency, url, pid, args.sessions, args.think_time,
+                              args.timeout, args.seed)
+        levels.append(lvl)
+        print(f"{lvl['concurrency']:>5} {lvl['reruns']:>6} {lvl['error_rate'] * 100:>5.1f} "
+              f"{lvl['p50_ms']:>7.0f} {lvl['p90_ms']:>7.0f} {lvl['p99_ms']:>7.0f} "
+              f"{lvl['throughput_rps']:>6.1f} {lvl['server_cpu_ms_per_rerun']:>7.0f}ms "
+              f"{lvl['server_cpu_cores']:>5.2f} {lvl['server_max_rss_mb']:>7.0f}")
+        print("      slowest: " + ", ".join(
+            f"{step} {ms:.0f}ms" for step, ms in lvl["slowest_steps"].items()))
+        for error in lvl["error_samples"]:
+            print(f"      ! {error}")
+        if not within_limits(lvl, args.max_p90_ms, args.max_error_rate):
+            break
+        capacity = concurrency
+    return levels, capacity
+
+
+# ============================================
+# CLI
+# ============================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--port", type=int, default=0, help="server port (default: a free one)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrent clinicians per level, ramped in order")
+    parser.add_argument("--sessions", type=int, default=2, help="sessions per clinician per level")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean seconds between interactions inside a session")
+    parser.add_argument("--max-p90-ms", type=float, default=2000.0,
+                        help="a level over this p90 rerun latency is past capacity")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="a level over this share of failed reruns is past capacity")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args(argv)
+
+    port = args.port or _free_port()
+    try:
+        server = start_server(args.app, port)
+    except RuntimeError as e:
+        print(f"Could not start {args.app}: {e}")
+        return 2
+    try:
+        levels, capacity = asyncio.run(
+            ramp(args, f"ws://127.0.0.1:{port}/_stcore/stream", server.pid))
+    finally:
+        stop_server(server)
+
+    limits = f"p90 <= {args.max_p90_ms:.0f}ms, errors <= {args.max_error_rate:.1%}"
+    if not capacity:
+        print(f"\nCapacity: below {args.levels[0]} concurrent clinicians ({limits})")
+    elif capacity == args.levels[-1]:
+        print(f"\nCapacity: at least {capacity} concurrent clinicians ({limits}); "
+              f"ramp further to find the limit")
+    else:
+        print(f"\nCapacity: {capacity} concurrent clinicians on one server ({limits})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"levels": levels, "capacity": capacity,
+                       "max_p90_ms": args.max_p90_ms,
+                       "max_error_rate": args.max_error_rate}, f, indent=2)
+    return 0 if capacity else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
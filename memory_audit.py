@@ -0,0 +1,146 @@
+"""
+Memory instrumentation for the Streamlit app.
+
+Enable with MEMORY_AUDIT=1. Shared (process-wide) data is measured once
+when it is loaded; each page render is measured with tracemalloc
+snapshots so per-session growth shows up in the report.
+
+tracemalloc is process-wide, so renders that overlap in other sessions
+are attributed to whichever render is being measured. Run with a single
+active session when you need exact per-render numbers. Snapshots add
+seconds to every render, so leave this off in production.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("MEMORY_AUDIT", "") == "1"
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate retained size of an object graph in bytes"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        # pandas DataFrame: getsizeof misses the column buffers
+        size += int(obj.memory_usage(deep=True).sum())
+    return size
+
+
+class MemoryAudit:
+    """Collects shared and per-session allocation figures"""
+
+    def __init__(self, frames=1, top=5, max_sessions=1000):
+        self.frames = frames
+        self.top = top
+        # Backstop when the runtime cannot be asked which sessions are live
+        self.max_sessions = max_sessions
+        self.shared = {}
+        self.sessions = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        return self
+
+    # ============================================
+    # SHARED DATA
+    # ============================================
+    @contextmanager
+    def track_shared(self, name):
+        """Measure memory retained by a process-wide loader"""
+        before = tracemalloc.get_traced_memory()[0]
+        yield
+        after = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            self.shared[name] = max(after - before, 0)
+
+    # ============================================
+    # PER-SESSION RENDERS
+    # ============================================
+    def begin_render(self, session_id, page):
+        """Take the snapshot that opens a page render"""
+        return {
+            "session_id": session_id,
+            "page": page,
+            "started": time.perf_counter(),
+            "snapshot": tracemalloc.take_snapshot(),
+        }
+
+    def end_render(self, token, session_state=None):
+        """Diff against the opening snapshot and record the render"""
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(token["snapshot"], "filename")
+        net = sum(stat.size_diff for stat in stats)
+        top = [
+            {"file": stat.traceback[0].filename, "size_diff": stat.size_diff}
+            for stat in sorted(stats, key=lambda s: s.size_diff, reverse=True)[:self.top]
+        ]
+
+        record = {
+            "page": token["page"],
+            "render_ms": (time.perf_counter() - token["started"]) * 1000,
+            "net_bytes": net,
+            "session_state_bytes": deep_sizeof(dict(session_state)) if session_state is not None else 0,
+            "top_allocations": top,
+            "at": time.time(),
+        }
+        self.prune_sessions()
+        with self._lock:
+            entry = self.sessions.pop(token["session_id"], None) or {"renders": 0}
+            entry["renders"] += 1
+            entry["last"] = record
+            # Re-insert so dict order is least recently rendered first
+            self.sessions[token["session_id"]] = entry
+            while len(self.sessions) > self.max_sessions:
+                del self.sessions[next(iter(self.sessions))]
+        return record
+
+    def forget_session(self, session_id):
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+    def prune_sessions(self):
+        """Drop sessions the Streamlit runtime no longer has open"""
+        from streamlit import runtime
+        if not runtime.exists():
+            return
+        instance = runtime.get_instance()
+        with self._lock:
+            ids = list(self.sessions)
+        for session_id in ids:
+            if not instance.is_active_session(session_id):
+                self.forget_session(session_id)
+
+    # ============================================
+    # REPORT
+    # ============================================
+    def report(self):
+        self.prune_sessions()
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            shared = dict(self.shared)
+            sessions = {sid: dict(entry) for sid, entry in self.sessions.items()}
+        per_session = [entry["last"]["session_state_bytes"] for entry in sessions.values()]
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "shared_bytes": sum(shared.values()),
+            "shared": shared,
+            "session_count": len(sessions),
+            "mean_session_state_bytes": sum(per_session) / len(per_session) if per_session else 0,
+            "sessions": sessions,
+        }
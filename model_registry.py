@@ -0,0 +1,203 @@
+"""
+Model registry with hot-reload for the clinical diagnostic model.
+
+Watches the models/ directory and swaps in a new heart_disease_model.pkl
+without restarting the Streamlit server, so clinician sessions survive
+model updates. A candidate model is only promoted after it passes
+validation against the active model.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+MODELS_DIR = "models"
+MODEL_FILE = "heart_disease_model.pkl"
+FEATURES_FILE = "feature_names.pkl"
+REFERENCE_DATA = "data/heart_disease_clean.csv"
+
+logger = logging.getLogger(__name__)
+
+
+class ModelValidationError(Exception):
+    """Raised when a candidate model fails validation"""
+
+
+def _file_hash(path):
+    """Short SHA-256 of a file, used as the model version"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _load_features(path):
+    with open(path, "rb") as f:
+        features_raw = pickle.load(f)
+    if hasattr(features_raw, 'tolist'):
+        return features_raw.tolist()
+    return list(features_raw)
+
+
+class ModelRegistry:
+    """Holds the active clinical model and promotes validated replacements"""
+
+    def __init__(self, models_dir=MODELS_DIR, reference_data=REFERENCE_DATA,
+                 tolerance=0.05, smoke_rows=50, poll_interval=5.0):
+        self.models_dir = models_dir
+        self.model_path = os.path.join(models_dir, MODEL_FILE)
+        self.features_path = os.path.join(models_dir, FEATURES_FILE)
+        self.reference_data = reference_data
+        self.tolerance = tolerance
+        self.smoke_rows = smoke_rows
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.last_error = None
+
+        # Initial load is trusted: there is nothing to compare against yet
+        self._seen = self._fingerprint()
+        self._active = self._load_candidate()
+        self._smoke_inputs = self._build_smoke_inputs(self._active["clinical_features"])
+
+    # ============================================
+    # LOADING
+    # ============================================
+    def _fingerprint(self):
+        """Cheap change detector: (mtime, size) of the model artifacts"""
+        stats = [os.stat(self.model_path), os.stat(self.features_path)]
+        return tuple((s.st_mtime_ns, s.st_size) for s in stats)
+
+    def _load_candidate(self):
+        with open(self.model_path, "rb") as f:
+            clinical_model = pickle.load(f)
+        return {
+            "clinical_model": clinical_model,
+            "clinical_features": _load_features(self.features_path),
+            "version": _file_hash(self.model_path),
+        }
+
+    def _build_smoke_inputs(self, features):
+        """Fixed rows from the training cohort used to compare models"""
+        if os.path.exists(self.reference_data):
+            df = pd.read_csv(self.reference_data, nrows=self.smoke_rows)
+            return df[features].astype(float)
+        # Fall back to a fixed random batch so the comparison is still deterministic
+        rng = np.random.default_rng(0)
+        return pd.DataFrame(
+            rng.normal(0, 1, size=(self.smoke_rows, len(features))),
+            columns=features
+        )
+
+    # ============================================
+    # VALIDATION
+    # ============================================
+    def validate(self, candidate):
+        """Check a candidate against the active model; raise on mismatch"""
+        active = self._active
+        if candidate["clinical_features"] != active["clinical_features"]:
+            raise ModelValidationError(
+                f"Feature list changed: {candidate['clinical_features']} "
+                f"!= {active['clinical_features']}"
+            )
+
+        X = self._smoke_inputs
+        new_prob = candidate["clinical_model"].predict_proba(X)[:, 1]
+        old_prob = active["clinical_model"].predict_proba(X)[:, 1]
+        if not np.all(np.isfinite(new_prob)):
+            raise ModelValidationError("Candidate produced non-finite probabilities")
+
+        max_diff = float(np.max(np.abs(new_prob - old_prob)))
+        if max_diff > self.tolerance:
+            raise ModelValidationError(
+                f"Smoke-test predictions differ by {max_diff:.3f} "
+                f"(tolerance {self.tolerance:.3f})"
+            )
+
+    # ============================================
+    # RELOAD
+    # ============================================
+    def _fail(self, message):
+        """Record why a refresh did not promote; log each new reason once"""
+        if message != self.last_error:
+            logger.warning("Model registry: %s", message)
+        self.last_error = message
+
+    def refresh(self):
+        """Promote the on-disk model if it changed and validates. Returns True on swap."""
+        with self._lock:
+            try:
+                fingerprint = self._fingerprint()
+            except FileNotFoundError as e:
+                # Mid-replacement; keep serving the active model
+                self._fail(f"Model file missing: {e}")
+                return False
+            if fingerprint == self._seen:
+                return False
+
+            try:
+                candidate = self._load_candidate()
+            except Exception as e:
+                # Likely a partially written file; retry on the next change
+                self._fail(f"Could not load candidate: {e}")
+                return False
+            self._seen = fingerprint
+
+            if candidate["version"] == self._active["version"]:
+                return False
+            try:
+                self.validate(candidate)
+            except ModelValidationError as e:
+                self._fail(f"Rejected model {candidate['version']}: {e}")
+                return False
+            except Exception as e:
+                # A model that cannot even score the smoke inputs is a rejection too
+                self._fail(
+                    f"Rejected model {candidate['version']}: smoke test raised "
+                    f"{type(e).__name__}: {e}"
+                )
+                return False
+
+            # Single reference assignment: readers see either old or new, never a mix
+            self._active = candidate
+            self.last_error = None
+            logger.info("Model registry: promoted model %s", candidate["version"])
+            return True
+
+    def current(self):
+        """Snapshot of the active model for one request"""
+        return self._active
+
+    # ============================================
+    # WATCHER
+    # ============================================
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            # The watcher must outlive any single bad refresh
+            try:
+                self.refresh()
+            except Exception as e:
+                self._fail(f"Refresh failed: {type(e).__name__}: {e}")
+
+    def start_watcher(self):
+        """Poll the models directory in a daemon thread"""
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="model-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+        return self
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
@@ -0,0 +1,190 @@
+"""
+Side-by-side scoring of the clinical model and challenger models.
+
+Challengers are pickled classifiers in models/candidates/. A batch is
+scaled once with the fitted models/scaler.pkl. Every model whose
+pipeline begins with an identical StandardScaler has that step replaced
+by "passthrough" and scores the pre-scaled batch. Models with different
+scaling (e.g. per-fold scalers inside CalibratedClassifierCV) keep their
+own pipeline and get the raw batch. The incumbent scores on the calling
+thread while the challengers run on a thread pool. A challenger that
+misses the timeout scores NaN instead of delaying the result. The
+per-patient probabilities and agreement are returned together.
+"""
+import copy
+import glob
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+MODELS_DIR = "models"
+CANDIDATES_DIR = os.path.join(MODELS_DIR, "candidates")
+SCALER_FILE = os.path.join(MODELS_DIR, "scaler.pkl")
+INCUMBENT = "incumbent"
+
+
+def candidates_fingerprint(candidates_dir=CANDIDATES_DIR):
+    """Cheap change detector for the candidates directory"""
+    paths = sorted(glob.glob(os.path.join(candidates_dir, "*.pkl")))
+    return tuple((p, os.stat(p).st_mtime_ns) for p in paths)
+
+
+def _same_scaler(a, b):
+    return (
+        isinstance(a, StandardScaler)
+        and getattr(a, "mean_", None) is not None
+        and a.mean_.shape == b.mean_.shape
+        and np.allclose(a.mean_, b.mean_)
+        and np.allclose(a.scale_, b.scale_)
+    )
+
+
+def _strip_pipeline(pipeline, scaler):
+    """Replace a leading scaler identical to the shared one; True if stripped"""
+    first = pipeline.steps[0][1]
+    if not _same_scaler(first, scaler):
+        return False
+    pipeline.steps[0] = (pipeline.steps[0][0], "passthrough")
+    return True
+
+
+def strip_shared_scaler(model, scaler):
+    """
+    Copy of model that expects input already scaled by `scaler`, or None if
+    any part of the model scales differently.
+    """
+    stripped = copy.deepcopy(model)
+    if isinstance(stripped, Pipeline):
+        return stripped if _strip_pipeline(stripped, scaler) else None
+    if isinstance(stripped, CalibratedClassifierCV):
+        inner = [cc.estimator for cc in stripped.calibrated_classifiers_]
+        if all(isinstance(p, Pipeline) and _strip_pipeline(p, scaler) for p in inner):
+            return stripped
+    return None
+
+
+class ModelSet:
+    """The incumbent plus challengers, scored together over one batch"""
+
+    def __init__(self, incumbent, features, candidates_dir=CANDIDATES_DIR,
+                 scaler_path=SCALER_FILE, threshold=0.5, timeout=1.0, max_workers=None):
+        self.features = list(features)
+        self.threshold = threshold
+        self.timeout = timeout
+
+        with open(scaler_path, "rb") as f:
+            self.scaler = pickle.load(f)
+
+        models = {INCUMBENT: incumbent}
+        # A broken candidate must never take the incumbent down with it
+        self.skipped = {}
+        for path in sorted(glob.glob(os.path.join(candidates_dir, "*.pkl"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                with open(path, "rb") as f:
+                    model = pickle.load(f)
+                n_features = getattr(model, "n_features_in_", len(self.features))
+                if n_features != len(self.features):
+                    raise ValueError(f"expects {n_features} features, not {len(self.features)}")
+                if not hasattr(model, "predict_proba"):
+                    raise ValueError("has no predict_proba")
+            except Exception as e:
+                self.skipped[name] = str(e)
+                continue
+            models[name] = model
+
+        # name -> (model to call, whether it takes the pre-scaled batch)
+        self.scorers = {}
+        for name, model in models.items():
+            stripped = strip_shared_scaler(model, self.scaler)
+            self.scorers[name] = (stripped, True) if stripped is not None else (model, False)
+
+        self.timeouts = dict.fromkeys(self.challengers, 0)
+        # Challenger -> call that missed its deadline while running; until it
+        # returns that challenger is skipped, so a hung model holds one worker
+        self._hung = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or max(len(self.challengers), 1),
+                                        thread_name_prefix="model-set")
+
+    @property
+    def names(self):
+        return list(self.scorers)
+
+    @property
+    def challengers(self):
+        return [name for name in self.scorers if name != INCUMBENT]
+
+    def _predict(self, name, X, X_scaled):
+        model, prescaled = self.scorers[name]
+        return model.predict_proba(X_scaled if prescaled else X)[:, 1]
+
+    def _submit(self, name, X, X_scaled):
+        with self._lock:
+            hung = self._hung.get(name)
+            if hung is not None:
+                if not hung.done():
+                    return None
+                del self._hung[name]
+        return self._pool.submit(self._predict, name, X, X_scaled)
+
+    def _timed_out(self, name, future):
+        with self._lock:
+            self.timeouts[name] += 1
+            # A call still queued is dropped; one already running marks the
+            # challenger hung until it returns
+            if future is not None and not future.cancel():
+                self._hung[name] = future
+
+    def score(self, X, timeout=None):
+        """
+        Score a batch with every model.
+
+        Returns a DataFrame indexed like X with one probability column per
+        model, plus mean/spread across models and the share of models that
+        agree with the incumbent's label (the incumbent counts itself).
+        Challengers that fail or miss the timeout (seconds, shared by all
+        challengers) score NaN.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        X = X[self.features]
+        needs_scaled = any(prescaled for _, prescaled in self.scorers.values())
+        # Scale once for every model that can share it
+        X_scaled = self.scaler.transform(X) if needs_scaled else None
+
+        futures = {name: self._submit(name, X, X_scaled) for name in self.challengers}
+        deadline = perf_counter() + timeout
+        probs = {INCUMBENT: self._predict(INCUMBENT, X, X_scaled)}
+
+        missing = np.full(len(X), np.nan)
+        for name, future in futures.items():
+            try:
+                if future is None:
+                    raise FutureTimeoutError
+                probs[name] = future.result(timeout=max(deadline - perf_counter(), 0))
+            except FutureTimeoutError:
+                self._timed_out(name, future)
+                probs[name] = missing
+            except Exception:
+                # A failing challenger scores NaN rather than failing the batch
+                probs[name] = missing
+        result = pd.DataFrame(probs, index=X.index)[self.names]
+
+        probs = result.to_numpy()
+        labels = probs >= self.threshold
+        agrees = np.where(np.isnan(probs), np.nan, labels == labels[:, [0]])
+        result["mean"] = result[self.names].mean(axis=1)
+        result["spread"] = result[self.names].max(axis=1) - result[self.names].min(axis=1)
+        result["agreement"] = np.nanmean(agrees, axis=1)
+        return result
+
+    def close(self):
+        self._pool.shutdown(wait=False)
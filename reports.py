@@ -0,0 +1,343 @@
+"""
+Printable diagnostic reports, built off the Streamlit script thread.
+
+A report is a self-contained HTML file with the clinical inputs, the
+probability gauge as an embedded PNG, the risk band, the model version
+and the medical disclaimer. Print it from the browser for a paper or PDF
+copy. Jobs go to a small worker pool, so a diagnosis only pays for
+enqueuing one. The page polls the job and offers the report once it is
+ready. Gauges are rendered with matplotlib's object API, which is safe
+across threads, and cached by whole-percent probability.
+
+Reports for single diagnoses are kept in memory and served as a
+download; batch mode writes one file per patient.
+
+Batch usage:
+    python reports.py patients.csv --out reports/batch
+"""
+import argparse
+import base64
+import html
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
+
+REPORTS_DIR = "reports"
+
+DISCLAIMER = (
+    "This is a screening tool only and not a substitute for professional "
+    "medical advice, diagnosis, or treatment."
+)
+
+# Same bands and colours as the gauge on the Clinical Diagnosis page
+RISK_BANDS = [
+    (0, 30, "Low", "#10b981"),
+    (30, 70, "Moderate", "#f59e0b"),
+    (70, 100, "High", "#ef4444"),
+]
+
+# Labels and codes as shown by the Clinical Diagnosis widgets
+INPUT_LABELS = {
+    "age": ("Age", lambda v: f"{v:.0f}"),
+    "sex": ("Sex", lambda v: ["Female", "Male"][int(v)]),
+    "cp": ("Chest Pain Type", lambda v: ["Typical", "Atypical", "Non-anginal", "Asymptomatic"][int(v) - 1]),
+    "trestbps": ("Resting Blood Pressure (mmHg)", lambda v: f"{v:.0f}"),
+    "chol": ("Serum Cholesterol (mg/dL)", lambda v: f"{v:.0f}"),
+    "fbs": ("Fasting Blood Sugar > 120 mg/dL", lambda v: ["No", "Yes"][int(v)]),
+    "restecg": ("Resting ECG", lambda v: ["Normal", "ST-T Abnormality", "LV Hypertrophy"][int(v)]),
+    "thalach": ("Maximum Heart Rate (bpm)", lambda v: f"{v:.0f}"),
+    "exang": ("Exercise Induced Angina", lambda v: ["No", "Yes"][int(v)]),
+    "oldpeak": ("ST Depression", lambda v: f"{v:.1f}"),
+    "slope": ("ST Slope", lambda v: ["Upsloping", "Flat", "Downsloping"][int(v) - 1]),
+    "ca": ("Major Vessels (ca)", lambda v: f"{v:.0f}"),
+    "thal": ("Thalassemia", lambda v: {3: "Normal", 6: "Fixed Defect", 7: "Reversible Defect"}[int(v)]),
+}
+
+
+def risk_band(prob):
+    """(label, colour) of the gauge band a probability falls in"""
+    percent = prob * 100
+    for low, high, label, colour in RISK_BANDS:
+        if percent < high:
+            return label, colour
+    return RISK_BANDS[-1][2], RISK_BANDS[-1][3]
+
+
+# ============================================
+# GAUGE IMAGES
+# ============================================
+def render_gauge(percent):
+    """PNG bytes of a half-circle gauge at a whole-number percentage"""
+    fig = Figure(figsize=(4, 2.4), dpi=150)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-1.1, 1.1)
+    ax.set_ylim(-0.25, 1.1)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    # 0% sits at 180 degrees, 100% at 0 degrees
+    for low, high, _, colour in RISK_BANDS:
+        ax.add_patch(Wedge((0, 0), 1, 180 - high * 1.8, 180 - low * 1.8,
+                           width=0.3, facecolor=colour, alpha=0.35))
+    ax.add_patch(Wedge((0, 0), 1, 180 - percent * 1.8, 180,
+                       width=0.12, facecolor="#ef4444"))
+    ax.text(0, 0.12, f"{percent}%", ha="center", va="center", fontsize=26, weight="bold")
+    ax.text(0, -0.15, "Heart Disease Probability", ha="center", va="center", fontsize=10)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", transparent=False, facecolor="white")
+    return buffer.getvalue()
+
+
+class GaugeCache:
+    """Rendered gauges keyed by whole-percent probability (at most 101)"""
+
+    def __init__(self):
+        self._images = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, prob):
+        percent = int(round(prob * 100))
+        # Rendering holds the GIL anyway, so serializing it costs nothing
+        # and guarantees each gauge is drawn once
+        with self._lock:
+            image = self._images.get(percent)
+            if image is not None:
+                self.hits += 1
+                return image
+            self.misses += 1
+            image = self._images[percent] = render_gauge(percent)
+            return image
+
+
+# ============================================
+# REPORT DOCUMENT
+# ============================================
+def build_report(record, prob, pred, model_version, gauge_png, created=None):
+    """Self-contained HTML report for one diagnosis"""
+    created = created or datetime.now()
+    band, colour = risk_band(prob)
+    verdict = "POSITIVE" if pred == 1 else "NEGATIVE"
+
+    rows = []
+    for feature, (label, fmt) in INPUT_LABELS.items():
+        if feature in record:
+            rows.append(
+                f"<tr><th>{html.escape(label)}</th>"
+                f"<td>{html.escape(fmt(float(record[feature])))}</td></tr>"
+            )
+
+    gauge = base64.b64encode(gauge_png).decode("ascii")
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Heart Disease Risk Report</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; color: #1a1a2e; max-width: 760px; margin: 32px auto; }}
+h1 {{ font-size: 1.5rem; border-bottom: 2px solid #0f3460; padding-bottom: 8px; }}
+.meta {{ color: #555; font-size: 0.9rem; }}
+.result {{ display: flex; align-items: center; gap: 24px; margin: 24px 0; }}
+.band {{ font-size: 1.2rem; font-weight: bold; color: {colour}; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ text-align: left; padding: 6px 10px; border-bottom: 1px solid #ddd; }}
+th {{ width: 55%; font-weight: normal; color: #444; }}
+.disclaimer {{ margin-top: 32px; padding: 12px; border: 1px solid #999; font-size: 0.9rem; }}
+@media print {{ body {{ margin: 0; }} }}
+</style>
+</head>
+<body>
+<h1>🫀 Heart Disease Risk Assessment</h1>
+<p class="meta">Generated {created:%Y-%m-%d %H:%M} · Model version {html.escape(str(model_version))}</p>
+<div class="result">
+  <img src="data:image/png;base64,{gauge}" width="320" alt="Probability gauge: {prob * 100:.1f}%">
+  <div>
+    <p class="band">{band} risk</p>
+    <p>Result: <strong>{verdict}</strong></p>
+    <p>Probability: {prob * 100:.1f}%</p>
+  </div>
+</div>
+<h2>Clinical Parameters</h2>
+<table>
+{chr(10).join(rows)}
+</table>
+<p class="disclaimer"><strong>⚠️ Medical Disclaimer:</strong> {DISCLAIMER}</p>
+</body>
+</html>
+"""
+
+
+# ============================================
+# WORKER POOL
+# ============================================
+class ReportService:
+    """
+    Background report generation.
+
+    submit() only enqueues and returns a job id. Poll status() and fetch
+    the finished report with read(). Single-diagnosis reports are kept in
+    memory and never written to disk; only batch jobs write files. Jobs are
+    forgotten after ttl seconds or beyond the newest max_jobs.
+    """
+
+    def __init__(self, workers=2, max_jobs=200, ttl=3600):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.gauges = GaugeCache()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reports")
+        # job id -> (future, filename, submitted at)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render(self, record, prob, pred, model_version, created):
+        document = build_report(record, prob, pred, model_version, self.gauges.get(prob), created)
+        return document.encode("utf-8")
+
+    def _write(self, path, *args):
+        document = self._render(*args)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Write then rename so a reader never sees a partial file
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(document)
+        os.replace(tmp, path)
+        return path
+
+    def _track(self, future, filename):
+        job_id = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            self._jobs[job_id] = (future, filename, now)
+            # Oldest first: drop expired jobs and anything past max_jobs
+            while self._jobs and (
+                len(self._jobs) > self.max_jobs
+                or now - next(iter(self._jobs.values()))[2] > self.ttl
+            ):
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def submit(self, record, prob, pred, model_version):
+        """Queue an in-memory report for one diagnosis; returns its job id"""
+        created = datetime.now()
+        future = self._pool.submit(
+            self._render, dict(record), float(prob), int(pred), model_version, created
+        )
+        return self._track(future, f"report-{created:%Y%m%d-%H%M%S}.html")
+
+    def submit_batch(self, records, probs, preds, model_version, out_dir, names=None):
+        """One report file per row in out_dir, generated in parallel; returns the job ids"""
+        created = datetime.now()
+        names = names if names is not None else [f"report-{i:05d}" for i in range(len(records))]
+        job_ids = []
+        for record, prob, pred, name in zip(records, probs, preds, names):
+            path = os.path.join(out_dir, f"{name}.html")
+            future = self._pool.submit(
+                self._write, path, dict(record), float(prob), int(pred), model_version, created
+            )
+            job_ids.append(self._track(future, os.path.basename(path)))
+        return job_ids
+
+    def _job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """'pending', 'done', 'failed' or 'unknown'"""
+        job = self._job(job_id)
+        if job is None:
+            return "unknown"
+        future = job[0]
+        if not future.done():
+            return "pending"
+        return "failed" if future.exception() else "done"
+
+    def error(self, job_id):
+        job = self._job(job_id)
+        return job[0].exception() if job and job[0].done() else None
+
+    def filename(self, job_id):
+        job = self._job(job_id)
+        return job[1] if job else None
+
+    def read(self, job_id):
+        """Bytes of a finished report, or None if it is not ready"""
+        if self.status(job_id) != "done":
+            return None
+        result = self._job(job_id)[0].result()
+        if isinstance(result, bytes):
+            return result
+        with open(result, "rb") as f:
+            return f.read()
+
+    def wait(self, job_ids, timeout=None):
+        """Block until the given jobs finish; returns the number that failed"""
+        futures = [job[0] for job in map(self._job, job_ids) if job]
+        wait(futures, timeout=timeout)
+        return sum(1 for f in futures if not f.done() or f.exception())
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+# ============================================
+# BATCH MODE
+# ============================================
+def main(argv=None):
+    import pandas as pd
+
+    from clinical_schema import validate
+    from model_registry import MODELS_DIR, ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Generate one diagnostic report per CSV row")
+    parser.add_argument("src", help="CSV with the 13 clinical input columns")
+    parser.add_argument("--out", default=os.path.join(REPORTS_DIR, "batch"))
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    models = ModelRegistry(args.models_dir).current()
+    model = models["clinical_model"]
+
+    started = time.perf_counter()
+    result = validate(pd.read_csv(args.src), features=models["clinical_features"])
+    X = result.valid
+    probs = model.predict_proba(X)[:, 1] if len(X) else []
+    preds = model.predict(X) if len(X) else []
+
+    # Named by source row so quarantined rows do not shift the numbering
+    service = ReportService(workers=args.workers, max_jobs=max(len(X), 1), ttl=float("inf"))
+    job_ids = service.submit_batch(X.to_dict("records"), probs, preds, models["version"],
+                                   args.out, names=[f"report-{row}" for row in X.index])
+    failed = service.wait(job_ids)
+    service.close()
+
+    print(f"Wrote {len(job_ids) - failed:,} reports in "
+          f"{time.perf_counter() - started:.2f}s -> {args.out}")
+    if len(result.quarantined):
+        # Keep the skipped rows, with their errors, traceable next to the reports
+        os.makedirs(args.out, exist_ok=True)
+        quarantine_path = os.path.join(args.out, "quarantined.csv")
+        result.quarantined.rename_axis("row").to_csv(quarantine_path)
+        print(f"  skipped {len(result.quarantined):,} invalid rows -> {quarantine_path}")
+    if failed:
+        print(f"  {failed:,} reports failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
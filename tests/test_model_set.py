@@ -0,0 +1,79 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from model_set import ModelSet
+
+FEATURES = ["a", "b", "c"]
+
+
+class SlowModel:
+    """Challenger that sleeps for `delay` seconds per call; class attributes so tests can steer it"""
+    delay = 0.2
+    calls = 0
+    n_features_in_ = len(FEATURES)
+
+    def predict_proba(self, X):
+        type(self).calls += 1
+        time.sleep(type(self).delay)
+        return np.tile([0.4, 0.6], (len(X), 1))
+
+
+@pytest.fixture
+def model_set(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(40, 3)), columns=FEATURES)
+    y = (X["a"] > 0).astype(int)
+    with open(tmp_path / "scaler.pkl", "wb") as f:
+        pickle.dump(StandardScaler().fit(X), f)
+    candidates = tmp_path / "candidates"
+    candidates.mkdir()
+    with open(candidates / "slow.pkl", "wb") as f:
+        pickle.dump(SlowModel(), f)
+
+    SlowModel.delay, SlowModel.calls = 0.2, 0
+    models = ModelSet(LogisticRegression().fit(X, y), FEATURES, candidates_dir=str(candidates),
+                      scaler_path=str(tmp_path / "scaler.pkl"), timeout=2.0)
+    yield models
+    models.close()
+
+
+def _batch():
+    return pd.DataFrame([[0.1, 0.2, 0.3]], columns=FEATURES)
+
+
+def test_concurrent_sessions_all_get_a_fast_challenger(model_set):
+    start = threading.Barrier(2)
+
+    def score(_):
+        start.wait()
+        return model_set.score(_batch())
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(score, range(2)))
+
+    for result in results:
+        assert result["slow"].notna().all()
+    assert model_set.timeouts == {"slow": 0}
+    assert SlowModel.calls == 2
+
+
+def test_hung_challenger_is_skipped_until_it_returns(model_set):
+    SlowModel.delay = 0.5
+    assert model_set.score(_batch(), timeout=0.05)["slow"].isna().all()
+    # Still running: the next call does not queue behind it
+    assert model_set.score(_batch(), timeout=0.05)["slow"].isna().all()
+    assert SlowModel.calls == 1
+    assert model_set.timeouts == {"slow": 2}
+
+    SlowModel.delay = 0.0
+    time.sleep(0.6)
+    assert model_set.score(_batch())["slow"].notna().all()
+    assert model_set.timeouts == {"slow": 2}